@@ -1,14 +1,77 @@
-from passlib.context import CryptContext
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException
 from jose import jwt
 from config.database import user_collection
 from bson import ObjectId
+from utils.MetricsUtil import HASH_QUEUE_DEPTH
+from dotenv import load_dotenv
+import asyncio
+import bcrypt
+import os
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+load_dotenv()
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", os.cpu_count() or 1))
+HASH_MAX_QUEUE = int(os.getenv("HASH_MAX_QUEUE", 64))
+
+# bcrypt only uses the first 72 bytes of a password; bcrypt>=5 raises instead of truncating
+BCRYPT_MAX_PASSWORD_BYTES = 72
+
+# bcrypt releases the GIL, so a dedicated thread pool keeps hashing off the event loop
+_hash_executor = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="bcrypt")
+_hash_queue_depth = 0
+
+def hash_queue_depth() -> int:
+    """Number of hash/verify jobs running or waiting in the executor."""
+    return _hash_queue_depth
+
+async def _run_hashing(func, *args):
+    global _hash_queue_depth
+    if _hash_queue_depth >= HASH_MAX_QUEUE:
+        raise HTTPException(status_code=503, detail="Server busy, please retry")
+
+    _hash_queue_depth += 1
+    HASH_QUEUE_DEPTH.inc()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_hash_executor, func, *args)
+    finally:
+        _hash_queue_depth -= 1
+        HASH_QUEUE_DEPTH.dec()
+
+def _secret(password: str) -> bytes:
+    # Same truncation older bcrypt releases applied silently, so existing hashes keep verifying
+    return password.encode("utf-8")[:BCRYPT_MAX_PASSWORD_BYTES]
+
+def _as_bytes(hashed_password) -> bytes:
+    return hashed_password.encode("utf-8") if isinstance(hashed_password, str) else hashed_password
+
+def _hash_rounds(hashed_password: bytes) -> int:
+    # $2b$12$<salt+hash>
+    try:
+        return int(hashed_password.split(b"$")[2])
+    except (IndexError, ValueError):
+        return 0
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return bcrypt.hashpw(_secret(password), bcrypt.gensalt(BCRYPT_ROUNDS)).decode("utf-8")
+
+def verify_password(plain_password: str, hashed_password) -> bool:
+    try:
+        return bcrypt.checkpw(_secret(plain_password), _as_bytes(hashed_password))
+    except ValueError:  # not a bcrypt hash
+        return False
+
+def _verify_and_update(plain_password: str, hashed_password):
+    if not verify_password(plain_password, hashed_password):
+        return False, None
+    if _hash_rounds(_as_bytes(hashed_password)) != BCRYPT_ROUNDS:
+        return True, hash_password(plain_password)
+    return True, None
+
+async def hash_password_async(password: str) -> str:
+    return await _run_hashing(hash_password, password)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
\ No newline at end of file
+async def verify_and_update_password(plain_password: str, hashed_password):
+    """Returns (valid, new_hash). new_hash is set when the stored hash uses a cost other than BCRYPT_ROUNDS."""
+    return await _run_hashing(_verify_and_update, plain_password, hashed_password)
@@ -0,0 +1,45 @@
+from concurrent.futures import ThreadPoolExecutor
+from auth import auth
+import asyncio
+import os
+import sys
+import time
+
+# Login throughput of verify_and_update_password for several HASH_WORKERS pool sizes.
+# Usage (from backend/): python -m config.bench_logins [logins] [workers,workers,...]
+# Uses BCRYPT_ROUNDS from the environment, so run it with the production cost factor.
+
+LOGINS = 64
+PASSWORD = "correct horse battery staple"
+
+def _worker_counts():
+    cpus = os.cpu_count() or 1
+    return sorted({1, 2, 4, cpus, cpus * 2})
+
+async def _logins(hashed: str, n: int):
+    results = await asyncio.gather(*(auth.verify_and_update_password(PASSWORD, hashed) for _ in range(n)))
+    assert all(valid for valid, _ in results)
+
+async def main(logins=LOGINS, worker_counts=None):
+    hashed = auth.hash_password(PASSWORD)
+    # Every login is queued at once, so let the whole batch in
+    auth.HASH_MAX_QUEUE = max(auth.HASH_MAX_QUEUE, logins)
+    print(f"{logins} concurrent logins, bcrypt cost {auth.BCRYPT_ROUNDS}, {os.cpu_count()} cpus")
+    print(f"{'HASH_WORKERS':<14}{'seconds':>10}{'logins/s':>10}{'ms/login':>10}")
+
+    for workers in worker_counts or _worker_counts():
+        previous, auth._hash_executor = auth._hash_executor, ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        previous.shutdown()
+        # Warm the pool's threads before timing
+        await _logins(hashed, workers)
+        started = time.perf_counter()
+        await _logins(hashed, logins)
+        elapsed = time.perf_counter() - started
+        print(f"{workers:<14}{elapsed:>10.2f}{logins / elapsed:>10.1f}{elapsed * 1000 / logins:>10.1f}")
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(main(
+        int(args[0]) if args else LOGINS,
+        [int(n) for n in args[1].split(",")] if len(args) > 1 else None,
+    ))
@@ -0,0 +1,106 @@
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from typing import List
+from config.database import tasks_collection
+from controllers.task_controller import get_project_tasks
+from models.task_model import TaskOut
+from utils.ResponseUtil import MongoJSONResponse, _default, _msgpack_default
+from utils.CompressionUtil import compress, brotli
+import asyncio
+import msgpack
+import orjson
+import sys
+import time
+
+# Bytes on the wire and CPU per request for a project's task list in every negotiated format.
+# Usage (from backend/): python -m config.bench_payloads [project_id] [repeats]
+# Without a project_id the project with the most tasks is used (run config.seed first).
+#
+# Response class comparison on synthetic tasks, no database needed:
+#   python -m config.bench_payloads responses [tasks] [repeats]
+
+REPEATS = 20
+SYNTHETIC_TASKS = 10000
+
+def _encoders():
+    encoders = {
+        "json": lambda tasks: orjson.dumps(tasks, default=_default, option=orjson.OPT_NON_STR_KEYS),
+        "msgpack": lambda tasks: msgpack.packb(tasks, default=_msgpack_default, use_bin_type=True),
+    }
+    for name in list(encoders):
+        encode = encoders[name]
+        encoders[f"{name}+gzip"] = lambda tasks, encode=encode: compress(encode(tasks), "gzip")
+        if brotli:
+            encoders[f"{name}+br"] = lambda tasks, encode=encode: compress(encode(tasks), "br")
+    return encoders
+
+async def _largest_project():
+    pipeline = [{"$group": {"_id": "$project_id", "n": {"$sum": 1}}}, {"$sort": {"n": -1}}, {"$limit": 1}]
+    result = await tasks_collection.aggregate(pipeline).to_list(1)
+    return result[0]["_id"] if result else None
+
+async def main(project_id=None, repeats=REPEATS):
+    project_id = ObjectId(project_id) if project_id else await _largest_project()
+    if project_id is None:
+        print("No tasks found, seed the database first")
+        return
+    tasks = await get_project_tasks(str(project_id))
+    print(f"project {project_id}: {len(tasks)} tasks, {repeats} runs per format")
+    print(f"{'format':<14}{'bytes':>12}{'ratio':>8}{'cpu ms/req':>12}")
+
+    baseline = None
+    for name, encode in _encoders().items():
+        started = time.process_time()
+        for _ in range(repeats):
+            body = encode(tasks)
+        cpu_ms = (time.process_time() - started) * 1000 / repeats
+        baseline = baseline or len(body)
+        print(f"{name:<14}{len(body):>12}{len(body) / baseline:>8.2f}{cpu_ms:>12.2f}")
+
+def synthetic_tasks(n: int = SYNTHETIC_TASKS):
+    """Raw task documents shaped like the tasks collection."""
+    project_id, module_ids, status_ids = ObjectId(), [ObjectId() for _ in range(20)], [ObjectId() for _ in range(4)]
+    return [{
+        "_id": ObjectId(),
+        "title": f"Task {i} dashboard export",
+        "priority": ("Low", "Medium", "High")[i % 3],
+        "description": "Implement the endpoint and cover the edge cases " * 2,
+        "totalMinutes": 30 + i % 480,
+        "module_id": module_ids[i % len(module_ids)],
+        "project_id": project_id,
+        "status_id": status_ids[i % len(status_ids)],
+        "ui_image_url": None,
+    } for i in range(n)]
+
+def _previous_path(tasks):
+    """What list routes did before MongoJSONResponse: per-task str() conversion into TaskOut,
+    response_model re-validation, jsonable_encoder and the stdlib JSONResponse."""
+    models = [
+        TaskOut(**{**task, "_id": str(task["_id"]), "project_id": str(task.get("project_id", ""))})
+        for task in tasks
+    ]
+    validated = TypeAdapter(List[TaskOut]).validate_python(models)
+    return JSONResponse(jsonable_encoder(validated)).body
+
+def _current_path(tasks):
+    return MongoJSONResponse(tasks).body
+
+def bench_responses(n: int = SYNTHETIC_TASKS, repeats: int = REPEATS):
+    tasks = synthetic_tasks(n)
+    print(f"{n} synthetic tasks, {repeats} runs per path")
+    print(f"{'path':<24}{'bytes':>12}{'cpu ms/req':>12}")
+    for name, render in (("TaskOut + JSONResponse", _previous_path), ("MongoJSONResponse", _current_path)):
+        started = time.process_time()
+        for _ in range(repeats):
+            body = render(tasks)
+        cpu_ms = (time.process_time() - started) * 1000 / repeats
+        print(f"{name:<24}{len(body):>12}{cpu_ms:>12.2f}")
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if args and args[0] == "responses":
+        bench_responses(int(args[1]) if len(args) > 1 else SYNTHETIC_TASKS, int(args[2]) if len(args) > 2 else REPEATS)
+    else:
+        asyncio.run(main(args[0] if args else None, int(args[1]) if len(args) > 1 else REPEATS))
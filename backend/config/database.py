@@ -1,16 +1,89 @@
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReadPreference
+from pymongo.read_concern import ReadConcern
 
 from dotenv import load_dotenv
+from utils.MetricsUtil import MongoCommandMetrics
 import os
 
 load_dotenv()
 mongo_db_url = os.getenv('MONGODB_URL')
-client = AsyncIOMotorClient(mongo_db_url)
-db = client['project_manager']
-user_collection = db['users']
-project_collection = db['projects']
-project_modules_collection = db['project_modules']
-status_collection = db['status']
-user_task_collection = db['user_tasks']
-tasks_collection = db['tasks']
-project_team_collection = db['project_teams']
\ No newline at end of file
+DATABASE_NAME = os.getenv('MONGO_DATABASE', 'project_manager')
+
+# Pool tuning
+MONGO_MAX_POOL_SIZE = int(os.getenv('MONGO_MAX_POOL_SIZE', 100))
+MONGO_MIN_POOL_SIZE = int(os.getenv('MONGO_MIN_POOL_SIZE', 5))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv('MONGO_MAX_IDLE_TIME_MS', 300000))
+
+# Listing endpoints can tolerate slightly stale data and be served from secondaries.
+# On a standalone server secondaryPreferred simply reads from the primary.
+LIST_READ_PREFERENCE = os.getenv('MONGO_LIST_READ_PREFERENCE', 'secondaryPreferred')
+LIST_READ_CONCERN = os.getenv('MONGO_LIST_READ_CONCERN', 'local')
+_READ_PREFERENCES = {
+    'primary': ReadPreference.PRIMARY,
+    'primaryPreferred': ReadPreference.PRIMARY_PREFERRED,
+    'secondary': ReadPreference.SECONDARY,
+    'secondaryPreferred': ReadPreference.SECONDARY_PREFERRED,
+    'nearest': ReadPreference.NEAREST,
+}
+
+_state = {"client": None}
+
+def get_client():
+    """The shared Motor client. Created by the app lifespan; scripts get one lazily on first use."""
+    if _state["client"] is None:
+        _state["client"] = AsyncIOMotorClient(
+            mongo_db_url,
+            maxPoolSize=MONGO_MAX_POOL_SIZE,
+            minPoolSize=MONGO_MIN_POOL_SIZE,
+            maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+            event_listeners=[MongoCommandMetrics()]
+        )
+    return _state["client"]
+
+def get_db():
+    return get_client()[DATABASE_NAME]
+
+async def connect_to_mongo():
+    client = get_client()
+    # Warm-up so the first request does not pay for server selection and connection setup
+    await client.admin.command("ping")
+    return client
+
+def close_mongo_connection():
+    if _state["client"] is not None:
+        _state["client"].close()
+        _state["client"] = None
+
+def listing_collection(name: str):
+    """Collection handle for list endpoints, using the listing read preference/concern."""
+    return get_db().get_collection(
+        name,
+        read_preference=_READ_PREFERENCES[LIST_READ_PREFERENCE],
+        read_concern=ReadConcern(LIST_READ_CONCERN)
+    )
+
+class _Lazy:
+    """Resolves to the current client's object on every access, so modules can keep
+    importing collections at import time while the client itself lives in the app lifespan."""
+
+    def __init__(self, resolve):
+        self._resolve = resolve
+
+    def __getattr__(self, attr):
+        return getattr(self._resolve(), attr)
+
+    def __getitem__(self, key):
+        return self._resolve()[key]
+
+client = _Lazy(get_client)
+db = _Lazy(get_db)
+user_collection = _Lazy(lambda: get_db()['users'])
+project_collection = _Lazy(lambda: get_db()['projects'])
+project_modules_collection = _Lazy(lambda: get_db()['project_modules'])
+status_collection = _Lazy(lambda: get_db()['status'])
+user_task_collection = _Lazy(lambda: get_db()['user_tasks'])
+tasks_collection = _Lazy(lambda: get_db()['tasks'])
+project_team_collection = _Lazy(lambda: get_db()['project_teams'])
+email_outbox_collection = _Lazy(lambda: get_db()['email_outbox'])
+version_collection = _Lazy(lambda: get_db()['versions'])
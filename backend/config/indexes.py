@@ -0,0 +1,119 @@
+from pymongo import ASCENDING, TEXT, IndexModel
+from pymongo.errors import OperationFailure
+from config.database import db
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Index registry: collection name -> indexes the controllers rely on.
+# Keep this in sync with the filters used in controllers/*.py.
+INDEXES = {
+    "users": [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+        IndexModel([("role", ASCENDING)], name="role"),
+        IndexModel([("manager_id", ASCENDING), ("role", ASCENDING)], name="manager_id_role"),
+        IndexModel([("projects", ASCENDING)], name="projects", sparse=True),
+    ],
+    "projects": [
+        IndexModel([("manager_email", ASCENDING)], name="manager_email"),
+        IndexModel([("title", TEXT), ("description", TEXT), ("technology", TEXT)], name="search_text",
+                   weights={"title": 10, "technology": 3, "description": 1}),
+    ],
+    "project_modules": [
+        IndexModel([("projectId", ASCENDING)], name="projectId"),
+        IndexModel([("moduleName", TEXT), ("description", TEXT)], name="search_text",
+                   weights={"moduleName": 10, "description": 1}),
+    ],
+    "status": [
+        IndexModel([("status", ASCENDING)], name="status"),
+    ],
+    "tasks": [
+        IndexModel([("project_id", ASCENDING), ("status_id", ASCENDING)], name="project_id_status_id"),
+        IndexModel([("module_id", ASCENDING)], name="module_id"),
+        IndexModel([("title", TEXT), ("description", TEXT)], name="search_text",
+                   weights={"title": 10, "description": 1}),
+    ],
+    "user_tasks": [
+        # One assignment per pair; run config.migrations dedupe_user_tasks before first build
+        IndexModel([("userId", ASCENDING), ("taskId", ASCENDING)], name="userId_taskId_unique", unique=True),
+        IndexModel([("userId", ASCENDING), ("projectId", ASCENDING)], name="userId_projectId"),
+        IndexModel([("taskId", ASCENDING)], name="taskId"),
+    ],
+    "email_outbox": [
+        IndexModel([("status", ASCENDING), ("next_attempt_at", ASCENDING)], name="status_next_attempt_at"),
+    ],
+    "project_teams": [
+        # One team document per project; run config.migrations dedupe_project_teams before first build
+        IndexModel([("projectId", ASCENDING)], name="projectId_unique", unique=True),
+        IndexModel([("developers", ASCENDING)], name="developers"),
+    ],
+}
+
+def _declared_key(index: IndexModel):
+    return list(index.document["key"].items())
+
+def _matches(index: IndexModel, info: dict):
+    declared = index.document
+    if declared.get("unique", False) != info.get("unique", False):
+        return False
+    key = _declared_key(index)
+    if any(direction == TEXT for _, direction in key):
+        # Mongo stores text indexes as _fts/_ftsx, compare the weighted fields instead
+        weights = declared.get("weights") or {}
+        return info.get("weights") == {field: weights.get(field, 1) for field, _ in key}
+    return list(info["key"]) == key
+
+async def ensure_indexes():
+    """Create every index declared in INDEXES. Existing indexes are left untouched."""
+    created = {}
+    for collection_name, indexes in INDEXES.items():
+        try:
+            created[collection_name] = await db[collection_name].create_indexes(indexes)
+        except OperationFailure as e:
+            # e.g. duplicate emails already stored -> unique index cannot be built
+            logger.error(f"Failed to build indexes on {collection_name}: {e}")
+            created[collection_name] = []
+    return created
+
+async def index_drift():
+    """Compare the registry with what exists in Mongo.
+
+    Returns {collection: {"missing": [...], "changed": [...], "extra": [...]}} for every
+    collection that does not match its declaration.
+    """
+    drift = {}
+    for collection_name, indexes in INDEXES.items():
+        existing = await db[collection_name].index_information()
+        existing.pop("_id_", None)
+
+        missing, changed = [], []
+        for index in indexes:
+            name = index.document["name"]
+            if name not in existing:
+                missing.append(name)
+                continue
+            info = existing.pop(name)
+            if not _matches(index, info):
+                changed.append(name)
+
+        if missing or changed or existing:
+            drift[collection_name] = {"missing": missing, "changed": changed, "extra": sorted(existing)}
+    return drift
+
+async def main(check_only: bool = False):
+    if not check_only:
+        await ensure_indexes()
+    drift = await index_drift()
+    if not drift:
+        print("Indexes are in sync with the registry")
+    for collection_name, report in drift.items():
+        print(f"{collection_name}: missing={report['missing']} changed={report['changed']} extra={report['extra']}")
+    return drift
+
+# Standalone usage (from backend/): python -m config.indexes [--check]
+if __name__ == "__main__":
+    import sys
+
+    drift = asyncio.run(main(check_only="--check" in sys.argv))
+    sys.exit(1 if drift else 0)
@@ -0,0 +1,96 @@
+from bson import ObjectId
+from pymongo import UpdateOne
+from config.database import user_task_collection, tasks_collection, project_team_collection
+from config.indexes import INDEXES
+from controllers.rollup_controller import repair_rollups
+import asyncio
+import sys
+
+# Data migrations and repair jobs. Usage (from backend/): python -m config.migrations [job ...]
+
+BATCH_SIZE = 1000
+
+async def backfill_user_task_project_ids():
+    """Adds projectId to user_tasks rows created before assignments stored it."""
+    updated = 0
+    cursor = user_task_collection.find({"projectId": {"$exists": False}}, {"taskId": 1}).batch_size(BATCH_SIZE)
+    batch = []
+
+    async def flush(batch):
+        task_ids = [ObjectId(row["taskId"]) for row in batch if ObjectId.is_valid(str(row["taskId"]))]
+        tasks = await tasks_collection.find({"_id": {"$in": task_ids}}, {"project_id": 1}).to_list(None)
+        project_by_task = {str(task["_id"]): str(task["project_id"]) for task in tasks if task.get("project_id")}
+        operations = [
+            UpdateOne({"_id": row["_id"]}, {"$set": {"projectId": project_by_task[str(row["taskId"])]}})
+            for row in batch if str(row["taskId"]) in project_by_task
+        ]
+        if operations:
+            result = await user_task_collection.bulk_write(operations, ordered=False)
+            return result.modified_count
+        return 0
+
+    async for row in cursor:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            updated += await flush(batch)
+            batch = []
+    if batch:
+        updated += await flush(batch)
+    return updated
+
+async def _replace_index(collection, old_name: str, index):
+    """Drops the non-unique predecessor of a unique index and builds the new one."""
+    if old_name in await collection.index_information():
+        await collection.drop_index(old_name)
+    await collection.create_indexes([index])
+
+async def dedupe_project_teams():
+    """Merges duplicate team documents of a project into the oldest one, then builds the unique projectId index."""
+    merged = 0
+    pipeline = [
+        {"$sort": {"_id": 1}},
+        {"$group": {"_id": "$projectId", "ids": {"$push": "$_id"}, "developers": {"$push": "$developers"}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+    ]
+    async for group in project_team_collection.aggregate(pipeline, allowDiskUse=True):
+        keep, duplicates = group["ids"][0], group["ids"][1:]
+        developers = list(dict.fromkeys(dev for team in group["developers"] for dev in (team or [])))
+        await project_team_collection.update_one({"_id": keep}, {"$set": {"developers": developers}})
+        result = await project_team_collection.delete_many({"_id": {"$in": duplicates}})
+        merged += result.deleted_count
+
+    await _replace_index(project_team_collection, "projectId", next(
+        index for index in INDEXES["project_teams"] if index.document["name"] == "projectId_unique"
+    ))
+    return merged
+
+async def dedupe_user_tasks():
+    """Deletes repeated (userId, taskId) assignments, keeping the oldest, then builds the unique index."""
+    removed = 0
+    pipeline = [
+        {"$sort": {"_id": 1}},
+        {"$group": {"_id": {"userId": "$userId", "taskId": "$taskId"}, "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+    ]
+    async for group in user_task_collection.aggregate(pipeline, allowDiskUse=True):
+        result = await user_task_collection.delete_many({"_id": {"$in": group["ids"][1:]}})
+        removed += result.deleted_count
+
+    await _replace_index(user_task_collection, "userId_taskId", next(
+        index for index in INDEXES["user_tasks"] if index.document["name"] == "userId_taskId_unique"
+    ))
+    return removed
+
+JOBS = {
+    "backfill_user_task_project_ids": backfill_user_task_project_ids,
+    "dedupe_project_teams": dedupe_project_teams,
+    "dedupe_user_tasks": dedupe_user_tasks,
+    "repair_rollups": repair_rollups,
+}
+
+async def main(job_names):
+    for name in job_names or JOBS:
+        print(f"{name}: {await JOBS[name]()}")
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1:]))
@@ -0,0 +1,181 @@
+from bson import ObjectId
+from datetime import date, timedelta
+from itertools import accumulate
+from config.database import db
+from config.indexes import ensure_indexes
+from controllers.rollup_controller import repair_rollups
+from auth.auth import hash_password
+import argparse
+import asyncio
+import random
+import struct
+
+# Synthetic data seeder for local performance testing.
+# Usage (from backend/): python -m config.seed --developers 500 --projects 200 --tasks 1000000 --drop
+
+STATUSES = ["Pending", "Assigned", "In Progress", "Completed"]
+STATUS_WEIGHTS = [0.2, 0.3, 0.25, 0.25]
+PRIORITIES = ["Low", "Medium", "High"]
+PRIORITY_WEIGHTS = [0.3, 0.5, 0.2]
+TECHNOLOGIES = ["Python FastAPI", "MERN Stack", "Django", "Spring Boot", "Flutter", "Go"]
+WORDS = ["api", "login", "report", "dashboard", "payment", "search", "export", "profile", "cache", "billing",
+         "invoice", "upload", "notification", "audit", "settings", "onboarding", "analytics", "sync"]
+DEFAULT_PASSWORD = "password"
+
+def zipf_cum_weights(n: int, s: float = 1.1):
+    """Cumulative weights where item i gets 1/(i+1)^s, so a few projects/developers get most of the work."""
+    return list(accumulate(1 / (i + 1) ** s for i in range(n)))
+
+def phrase(rng: random.Random, words: int = 3):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+async def insert_batches(collection, docs, batch_size: int, concurrency: int = 4):
+    """Inserts documents with unordered insert_many, a few batches in flight at a time."""
+    docs = list(docs)
+    slots = asyncio.Semaphore(concurrency)
+
+    async def insert(batch):
+        async with slots:
+            await collection.insert_many(batch, ordered=False)
+
+    await asyncio.gather(*(insert(docs[k:k + batch_size]) for k in range(0, len(docs), batch_size)))
+    return len(docs)
+
+def id_factory(seed: int):
+    """Deterministic, increasing ObjectIds so the same seed always produces the same data."""
+    timestamp = 1735689600 + seed  # 2025-01-01
+    counter = iter(range(2 ** 63))
+    return lambda: ObjectId(struct.pack(">IQ", timestamp, next(counter)))
+
+async def seed(args):
+    rng = random.Random(args.seed)
+    new_id = id_factory(args.seed)
+    today = date(2025, 1, 1)
+
+    if args.drop:
+        for name in ["users", "projects", "project_modules", "status", "tasks", "user_tasks", "project_teams",
+                     "versions", "email_outbox"]:
+            await db[name].drop()
+
+    # Statuses
+    statuses = [{"_id": new_id(), "status": name} for name in STATUSES]
+    await db["status"].insert_many(statuses)
+    status_cum_weights = list(accumulate(STATUS_WEIGHTS))
+
+    # Users (one shared hash, bcrypt per user would dominate seeding time)
+    password_hash = hash_password(DEFAULT_PASSWORD)
+    users = {}
+    for role, count in (("admin", args.admins), ("manager", args.managers), ("developer", args.developers)):
+        users[role] = [{
+            "_id": new_id(),
+            "firstname": f"{role.capitalize()}{i}",
+            "email": f"{role}{i}.{args.seed}@example.com",
+            "role": role,
+            "password": password_hash
+        } for i in range(count)]
+    managers, developers = users["manager"], users["developer"]
+    for developer in developers:
+        if managers:
+            developer["manager_id"] = rng.choice(managers)["_id"]
+    await insert_batches(db["users"], (user for role_users in users.values() for user in role_users), args.batch_size)
+
+    # Projects, teams and modules
+    projects, teams, modules_by_project = [], [], {}
+    developer_cum_weights = zipf_cum_weights(len(developers)) if developers else None
+    for i in range(args.projects):
+        manager = rng.choice(managers) if managers else None
+        start = today + timedelta(days=rng.randint(0, 365))
+        project = {
+            "_id": new_id(),
+            "title": f"{phrase(rng, 2)} {i}",
+            "description": phrase(rng, 8),
+            "technology": rng.choice(TECHNOLOGIES),
+            "estimatedHours": rng.randint(40, 2000),
+            "startDate": start.isoformat(),
+            "completionDate": (start + timedelta(days=rng.randint(30, 365))).isoformat(),
+            "manager_email": manager["email"] if manager else None,
+            "manager_id": manager["_id"] if manager else None
+        }
+        projects.append(project)
+
+        team_size = min(len(developers), rng.randint(2, args.max_team_size))
+        # dict.fromkeys dedupes in draw order; a set would order by hash and break determinism
+        team = list(dict.fromkeys(
+            dev["_id"] for dev in rng.choices(developers, cum_weights=developer_cum_weights, k=team_size)
+        )) if developers else []
+        teams.append({"_id": new_id(), "projectId": project["_id"], "manager_id": project["manager_id"], "developers": team})
+
+        modules_by_project[project["_id"]] = [{
+            "_id": new_id(),
+            "projectId": project["_id"],
+            "moduleName": f"{phrase(rng, 2)} module",
+            "description": phrase(rng, 6),
+            "estimatedHours": rng.randint(8, 400),
+            "status": rng.choice(statuses)["_id"],
+            "startDate": start.isoformat(),
+            "project_name": project["title"]
+        } for _ in range(rng.randint(1, args.max_modules))]
+
+    await insert_batches(db["projects"], projects, args.batch_size)
+    await insert_batches(db["project_teams"], teams, args.batch_size)
+    await insert_batches(db["project_modules"], (m for modules in modules_by_project.values() for m in modules), args.batch_size)
+
+    # Tasks and assignments, flushed in chunks so millions of tasks never sit in memory
+    project_cum_weights = zipf_cum_weights(len(projects))
+    team_by_project = {team["projectId"]: team["developers"] for team in teams}
+    chunk_size = args.batch_size * 4
+    task_chunk, assignment_chunk = [], []
+    total_tasks, total_assignments = 0, 0
+
+    for i in range(args.tasks if projects else 0):
+        project = rng.choices(projects, cum_weights=project_cum_weights)[0]
+        task = {
+            "_id": new_id(),
+            "title": f"{phrase(rng)} #{i}",
+            "priority": rng.choices(PRIORITIES, weights=PRIORITY_WEIGHTS)[0],
+            "description": phrase(rng, 12),
+            "totalMinutes": int(rng.lognormvariate(5, 0.8)),
+            "module_id": rng.choice(modules_by_project[project["_id"]])["_id"],
+            "project_id": project["_id"],
+            "status_id": rng.choices(statuses, cum_weights=status_cum_weights)[0]["_id"],
+            "ui_image_url": None
+        }
+        task_chunk.append(task)
+
+        # Stored as strings, like assign_task does
+        team = team_by_project[project["_id"]]
+        if team and rng.random() < args.assigned_ratio:
+            for developer_id in dict.fromkeys(rng.choices(team, k=rng.randint(1, 2))):
+                assignment_chunk.append({
+                    "_id": new_id(), "userId": str(developer_id), "taskId": str(task["_id"]), "projectId": str(project["_id"])
+                })
+
+        if len(task_chunk) >= chunk_size or i == args.tasks - 1:
+            total_tasks += await insert_batches(db["tasks"], task_chunk, args.batch_size)
+            total_assignments += await insert_batches(db["user_tasks"], assignment_chunk, args.batch_size)
+            task_chunk, assignment_chunk = [], []
+
+    await ensure_indexes()
+    await repair_rollups()
+
+    print(f"Seeded {sum(len(u) for u in users.values())} users, {len(projects)} projects, "
+          f"{sum(len(m) for m in modules_by_project.values())} modules, {total_tasks} tasks, "
+          f"{total_assignments} assignments (seed={args.seed}, password='{DEFAULT_PASSWORD}')")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Seed a local MongoDB with synthetic project data")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--admins", type=int, default=2)
+    parser.add_argument("--managers", type=int, default=10)
+    parser.add_argument("--developers", type=int, default=100)
+    parser.add_argument("--projects", type=int, default=50)
+    parser.add_argument("--max-modules", type=int, default=8)
+    parser.add_argument("--max-team-size", type=int, default=12)
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--assigned-ratio", type=float, default=0.8)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--drop", action="store_true", help="drop the seeded collections first")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    asyncio.run(seed(parse_args()))
@@ -1,7 +1,16 @@
 from fastapi import HTTPException
 from bson import ObjectId
-from config.database import project_team_collection, user_collection, project_collection
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from typing import List
+from config.database import project_team_collection, user_collection, project_collection, listing_collection
 from controllers.email_controller import send_manager_assignment_email, send_manager_removal_email,send_developer_assigned_email,send_developer_deassigned_email
+from utils.PaginationUtil import paginate, DEFAULT_PAGE_SIZE
+from utils.ETagUtil import bump_versions
+from utils.ProjectCacheUtil import project_cache
+
+# Never fetch password hashes for listings
+USER_LIST_PROJECTION = {"firstname": 1, "email": 1, "role": 1}
 
 # Function to assign manager to project
 async def assign_manager_to_project(project_id: str, manager_id: str):
@@ -23,6 +32,8 @@ async def assign_manager_to_project(project_id: str, manager_id: str):
 
     if result.modified_count == 0:
         raise HTTPException(status_code=400, detail="Failed to assign manager")
+    await project_cache.invalidate(project_id)
+    await bump_versions("projects")
     
     result = await project_team_collection.update_one(
         {"projectId": ObjectId(project_id)},
@@ -60,6 +71,8 @@ async def deassign_manager_from_project(project_id: str, manager_id: str):
 
     if result.modified_count == 0:
         raise HTTPException(status_code=400, detail="Failed to deassign manager")
+    await project_cache.invalidate(project_id)
+    await bump_versions("projects")
     
     # Send email notification
     manager = await user_collection.find_one({"_id": ObjectId(manager_id)})
@@ -68,136 +81,111 @@ async def deassign_manager_from_project(project_id: str, manager_id: str):
 
     return {"message": f"Manager {manager_id} removed from Project {str(project_id)}"}
 
-async def get_all_managers():
-    managers_cursor = user_collection.find({"role": "manager"})
-    managers = await managers_cursor.to_list(length=None)
+async def get_all_managers(limit: int = DEFAULT_PAGE_SIZE, after: str = None):
+    managers, next_after = await paginate(listing_collection('users'), {"role": "manager"}, USER_LIST_PROJECTION, limit, after)
 
-    if not managers:
+    if not managers and not after:
         raise HTTPException(status_code=404, detail="No managers found")
 
-    # Convert ObjectId to string for JSON response
-    for manager in managers:
-        manager["_id"] = str(manager["_id"])
-
-    return [{**manager, "_id": str(manager["_id"])} for manager in managers]
+    return managers, next_after
 
-async def get_all_developers():
-    developers_cursor = user_collection.find({"role": "developer"})
-    developers = await developers_cursor.to_list(length=None)
+async def get_all_developers(limit: int = DEFAULT_PAGE_SIZE, after: str = None):
+    developers, next_after = await paginate(listing_collection('users'), {"role": "developer"}, {**USER_LIST_PROJECTION, "manager_id": 1}, limit, after)
 
-    if not developers:
+    if not developers and not after:
         raise HTTPException(status_code=404, detail="No developers found")
 
-    # Convert ObjectId to string for JSON response
-    for developer in developers:
-        developer["_id"] = str(developer["_id"])
-        if "manager_id" in developer:
-            developer["manager_id"] = str(developer["manager_id"])
-
-    return developers
+    return developers, next_after
 
-async def assign_developers_to_project(project_id: str, developer_id: str):
-    if not ObjectId.is_valid(project_id):
+async def _load_project_and_developers(project_id: str, developer_ids: List[str]):
+    if not ObjectId.is_valid(project_id) or not all(ObjectId.is_valid(dev) for dev in developer_ids):
         raise HTTPException(status_code=400, detail="Invalid ID format")
-    
-    # Validate project existence
-    project = await project_collection.find_one({"_id": ObjectId(project_id)})
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-
-    developer = await user_collection.find_one({"_id": ObjectId(developer_id), "role": "developer"})
-    if not developer:
-        raise HTTPException(status_code=400, detail="Developer not found or not a valid developer role")
-
-    # Fetch existing project team entry
-    project_team = await project_team_collection.find_one({"projectId": ObjectId(project_id)})
-    existing_developers = project_team.get("developers", []) if project_team else []
-    existing_developers = [ObjectId(dev) if isinstance(dev, str) else dev for dev in existing_developers]
-
-    # Combine existing and new developers correctly
-    if ObjectId(developer_id) in existing_developers:
-        raise HTTPException(status_code=400, detail="Developer already assigned to the project")
-
-    # Add the new developer
-    updated_developers = existing_developers + [ObjectId(developer_id)]
-    
-    # Fetch manager ID from email
-    manager = await user_collection.find_one({"email": project.get('manager_email')})
-    if not manager:
-        raise HTTPException(status_code=404, detail="Manager not found")
-    
-    manager_id = manager['_id']
-    manager_email = manager.get('email')
-
-    # Update or create project team entry
-    if project_team:
-        result = await project_team_collection.update_one(
-            {"projectId": ObjectId(project_id)},
-            {"$set": {"developers": updated_developers, "manager_id": manager_id}}
-        )
-        if result.modified_count == 0:
-            print("No document was updated. Check if projectId exists in project_team_collection.")
-    else:
-        insert_result = await project_team_collection.insert_one(
-            {"projectId": ObjectId(project_id), "developers": updated_developers, "manager_id": manager_id}
-        )
-        if not insert_result.inserted_id:
-            raise HTTPException(status_code=500, detail="Insertion failed.")
-    
-     # Send email notification
-    send_developer_assigned_email(developer, project, manager_email)
-    
-    return {"message": "Developers assigned successfully"}
+    if not developer_ids:
+        raise HTTPException(status_code=400, detail="No developers provided")
 
-# Function to deassign developers from a project
-async def deassign_developers_from_project(project_id: str, developer_id: str):
-    if not ObjectId.is_valid(project_id):
-        raise HTTPException(status_code=400, detail="Invalid ID format")
-    
     # Validate project existence
     project = await project_collection.find_one({"_id": ObjectId(project_id)})
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    # Validate developer
-    developer = await user_collection.find_one({"_id": ObjectId(developer_id), "role": "developer"})
-    if not developer:
-        raise HTTPException(status_code=400, detail="Developer not found or not a valid developer role")
+    # Validate all developers with one query
+    developer_oids = list(dict.fromkeys(ObjectId(dev) for dev in developer_ids))
+    developers = await user_collection.find({"_id": {"$in": developer_oids}, "role": "developer"}).to_list(None)
+    found = {dev["_id"] for dev in developers}
+    missing = [str(dev) for dev in developer_oids if dev not in found]
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Developer not found or not a valid developer role: {', '.join(missing)}")
 
-    # Fetch existing project team entry
-    project_team = await project_team_collection.find_one({"projectId": ObjectId(project_id)})
-
-    if not project_team:
-        raise HTTPException(status_code=404, detail="Project team not found")
+    if not project.get("manager_email"):
+        raise HTTPException(status_code=404, detail="Manager not found")
 
-    existing_developers = project_team.get("developers", [])
+    return project, developers
+
+async def assign_developers_to_project(project_id: str, developer_ids: List[str]):
+    project, developers = await _load_project_and_developers(project_id, developer_ids)
+    manager_id = project.get("manager_id")
+    if not manager_id:
+        manager = await user_collection.find_one({"email": project["manager_email"]}, {"_id": 1})
+        if not manager:
+            raise HTTPException(status_code=404, detail="Manager not found")
+        manager_id = manager["_id"]
+
+    # Single atomic upsert; the previous document tells us who was already on the team.
+    # Two concurrent first assignments race on the unique projectId index: the loser
+    # gets DuplicateKeyError and its retry updates the document the winner created.
+    for attempt in range(2):
+        try:
+            before = await project_team_collection.find_one_and_update(
+                {"projectId": ObjectId(project_id)},
+                {"$addToSet": {"developers": {"$each": [dev["_id"] for dev in developers]}}, "$set": {"manager_id": manager_id}},
+                upsert=True,
+                return_document=ReturnDocument.BEFORE
+            )
+            break
+        except DuplicateKeyError:
+            if attempt:
+                raise HTTPException(status_code=409, detail="Project team was modified concurrently, please retry")
+    existing = {str(dev) for dev in (before or {}).get("developers", [])}
+    added = [dev for dev in developers if str(dev["_id"]) not in existing]
+
+    if not added:
+        raise HTTPException(status_code=400, detail="Developer already assigned to the project")
 
-    # Ensure proper ObjectId conversion
-    existing_developers = [ObjectId(dev) if isinstance(dev, str) else dev for dev in existing_developers]
+    # Send email notification
+    for developer in added:
+        await send_developer_assigned_email(developer, project, project["manager_email"])
 
-     # Check if developer is in the list
-    if ObjectId(developer_id) not in existing_developers:
-        raise HTTPException(status_code=400, detail="Developer not assigned to this project")
+    return {
+        "message": "Developers assigned successfully",
+        "assigned": [str(dev["_id"]) for dev in added],
+        "already_assigned": [str(dev["_id"]) for dev in developers if str(dev["_id"]) in existing]
+    }
 
-    # Remove only selected developers
-    updated_developers = [dev for dev in existing_developers if dev != ObjectId(developer_id)]
-    
-    # Fetch manager ID from email
-    manager = await user_collection.find_one({"email": project.get('manager_email')})
-    if not manager:
-        raise HTTPException(status_code=404, detail="Manager not found")
-    
-    manager_email = manager.get('email')
+# Function to deassign developers from a project
+async def deassign_developers_from_project(project_id: str, developer_ids: List[str]):
+    project, developers = await _load_project_and_developers(project_id, developer_ids)
 
-    # Update project team document
-    result = await project_team_collection.update_one(
+    # Older team documents may hold ids as strings, pull both forms
+    ids = [dev["_id"] for dev in developers]
+    before = await project_team_collection.find_one_and_update(
         {"projectId": ObjectId(project_id)},
-        {"$set": {"developers": updated_developers}}
+        {"$pull": {"developers": {"$in": ids + [str(dev_id) for dev_id in ids]}}},
+        return_document=ReturnDocument.BEFORE
     )
+    if not before:
+        raise HTTPException(status_code=404, detail="Project team not found")
 
-    if result.modified_count == 0:
-        raise HTTPException(status_code=400, detail="Failed to deassign developers")
+    existing = {str(dev) for dev in before.get("developers", [])}
+    removed = [dev for dev in developers if str(dev["_id"]) in existing]
+    if not removed:
+        raise HTTPException(status_code=400, detail="Developer not assigned to this project")
 
     # Send email notification
-    send_developer_deassigned_email(developer, project, manager_email)
-    return {"message": "Developers deassigned successfully"}
+    for developer in removed:
+        await send_developer_deassigned_email(developer, project, project["manager_email"])
+
+    return {
+        "message": "Developers deassigned successfully",
+        "deassigned": [str(dev["_id"]) for dev in removed],
+        "not_assigned": [str(dev["_id"]) for dev in developers if str(dev["_id"]) not in existing]
+    }
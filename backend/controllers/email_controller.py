@@ -1,38 +1,25 @@
-import aiosmtplib
-from email.mime.text import MIMEText
-from dotenv import load_dotenv
+from datetime import datetime
 from fastapi import HTTPException
-import os
-
-# Load environment variables
-load_dotenv()
-SMTP_SERVER = "smtp.gmail.com"
-SMTP_PORT = 465
-GMAIL_USER = os.getenv("GMAIL_USER")
-GMAIL_APP_PASSWORD = os.getenv("GMAIL_APP_PASSWORD")
+from config.database import email_outbox_collection
+from utils.EmailWorker import email_worker
 
 # Common email sending function
 async def send_email(recipient_email, subject, body):
-    """ Sends an email with the given subject and body. """
+    """ Queues an email in the outbox; the background worker delivers it. """
     if not recipient_email:
         raise HTTPException(status_code=400, detail="Recipient email not provided")
 
-    msg = MIMEText(body, "html")
-    msg['Subject'] = subject
-    msg['From'] = GMAIL_USER
-    msg['To'] = recipient_email
-
-    try:
-        print("Connecting to SMTP server...")
-        server = aiosmtplib.SMTP(hostname=SMTP_SERVER, port=SMTP_PORT,use_tls=True)
-        await server.connect()
-
-        await server.login(GMAIL_USER, GMAIL_APP_PASSWORD)
-        await server.sendmail(GMAIL_USER, recipient_email, msg.as_string())
-        await server.quit()
-        print(f"Email sent successfully to {recipient_email}!")
-    except Exception as e:
-        print(f"Failed to send email to {recipient_email}: {e}")
+    now = datetime.utcnow()
+    await email_outbox_collection.insert_one({
+        "recipient": recipient_email,
+        "subject": subject,
+        "body": body,
+        "status": "pending",
+        "attempts": 0,
+        "created_at": now,
+        "next_attempt_at": now
+    })
+    email_worker.wake()
 
 # Function to generate a styled HTML email
 def generate_email_body(title, user_name, message):
@@ -173,3 +160,15 @@ async def send_task_removal_email(user, task):
     message = f"You have been removed from the task: <span class='highlight'>{task_title}</span>."
     body = generate_email_body("Task Removed", user_name, message)
     await send_email(user_email, subject, body)
+
+# --- Bulk Task Assignment ---
+async def send_bulk_task_assignment_email(user, tasks):
+    """ Sends one email listing every task assigned to a user in a bulk assignment. """
+    user_email = user.get("email")
+    user_name = user.get("firstname", "User")
+    task_titles = "".join(f"<li class='highlight'>{task.get('title', 'Unnamed Task')}</li>" for task in tasks)
+
+    subject = "Task Assignment Notification"
+    message = f"You have been assigned {len(tasks)} new task(s):<ul>{task_titles}</ul>"
+    body = generate_email_body("Tasks Assigned", user_name, message)
+    await send_email(user_email, subject, body)
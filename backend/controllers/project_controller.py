@@ -1,18 +1,44 @@
 from models.project_model import Project,ProjectOut
-from config.database import project_collection,user_collection,tasks_collection,project_team_collection,project_modules_collection,user_task_collection
+from config.database import client,project_collection,user_collection,tasks_collection,project_team_collection,project_modules_collection,user_task_collection
 from fastapi import HTTPException
 from bson import ObjectId
+from pymongo.errors import OperationFailure
+from utils.PaginationUtil import paginate, DEFAULT_PAGE_SIZE
+from utils.ETagUtil import bump_versions, tasks_scope, modules_scope
+from utils.ProjectCacheUtil import project_cache
+from controllers.status_controller import find_status_by_id
+import logging
+
+logger = logging.getLogger(__name__)
+
+CASCADE_BATCH_SIZE = 1000
+# Above this many tasks a project is deleted outside a transaction (size/time limits)
+CASCADE_TRANSACTION_MAX_TASKS = 10000
+ILLEGAL_OPERATION = 20  # "Transaction numbers are only allowed on a replica set member or mongos"
+
+# Only the columns the project lists render
+PROJECT_LIST_PROJECTION = {
+    "title": 1,
+    "description": 1,
+    "technology": 1,
+    "estimatedHours": 1,
+    "startDate": 1,
+    "completionDate": 1,
+    "manager_email": 1,
+    "rollup": 1
+}
 
 async def create_project(project: Project):
     # Admin creates a project without assigning developers
     project_data = project.dict()
-    print(project_data)
+    logger.debug(f"Creating project: {project_data}")
     # If you need to process the manager_email, add logic here, e.g., check if manager_email exists in the user database
     manager = await user_collection.find_one({"email": project_data["manager_email"], "role": "manager"})
     if not manager:
         raise HTTPException(status_code=400, detail="Manager not found")
 
     result = await project_collection.insert_one(project_data)
+    await bump_versions("projects")
     project_data["_id"] = str(result.inserted_id)  # Convert ObjectId to string
 
     return project_data
@@ -39,58 +65,10 @@ async def get_project(project_id: str):
     return project
 
 
-async def delete_project(project_id: str):
-    # Validate project_id
-    if not ObjectId.is_valid(project_id):
-        raise HTTPException(status_code=400, detail="Invalid project ID format")
-    
-    # Check if project exists
-    project = await project_collection.find_one({"_id": ObjectId(project_id)})
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-    
-    # Step 1: Fetch all task IDs associated with this project
-    task_ids = await tasks_collection.find({"project_id": ObjectId(project_id)}, {"_id": 1}).to_list(None)
-    task_id_list = [task["_id"] for task in task_ids]  # Extract task IDs
-
-    # Debugging prints
-    print("Task IDs to delete from user_task_collection:", task_id_list)
-    
-    # Step 2: Remove these tasks from user_task_collection
-    if task_id_list:
-        delete_result = await user_task_collection.delete_many(
-            {"taskId": {"$in": task_id_list}}
-        )
-        print(f"Deleted user_task documents: {delete_result.deleted_count}")
-
-    # Step 3: Delete related tasks
-    await tasks_collection.delete_many({"project_id": ObjectId(project_id)})
-
-    # Step 4: Delete related modules
-    await project_modules_collection.delete_many({"projectId": ObjectId(project_id)})
-
-    # Step 5: Delete related team assignments
-    await project_team_collection.delete_many({"project_id": ObjectId(project_id)})
-
-    # Step 6: Remove project references from users
-    await user_collection.update_many(
-        {},  # Match all users
-        {"$pull": {"projects": ObjectId(project_id)}}
-    )
-
-    # Step 7: Finally, delete the project itself
-    result = await project_collection.delete_one({"_id": ObjectId(project_id)})
-    
-    if result.deleted_count == 0:
-        raise HTTPException(status_code=500, detail="Failed to delete project")
-    
-    return {"message": "Project, tasks, modules, teams, and related data deleted successfully"}
-
-async def get_all_projects():
-    projects = await project_collection.find().to_list(None)  # Fetch all projects
-    for project in projects:
-        project["_id"] = str(project["_id"])  # Convert ObjectId to string  # Convert developer ObjectIds to strings
-    return projects
+async def get_all_projects(limit: int = DEFAULT_PAGE_SIZE, after: str = None):
+    # Read from the primary: the route's ETag comes from the primary's version counters,
+    # and a lagging secondary could pair an old page with the new tag
+    return await paginate(project_collection, {}, PROJECT_LIST_PROJECTION, limit, after)
 
 async def assign_manager_to_project(project_id: str, manager_id: str):
     try:
@@ -117,6 +95,8 @@ async def assign_manager_to_project(project_id: str, manager_id: str):
 
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="Project not found")
+        await project_cache.invalidate(project_id_object)
+        await bump_versions("projects")
 
         return {"message": "Manager assigned successfully"}
 
@@ -244,53 +224,157 @@ async def get_assigned_developers(project_id: str):
         raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
 
 
-async def delete_project(project_id: str):
-    # Validate project_id
+async def get_project_dashboard(project_id: str):
+    """Project, modules, task stats and team in a single aggregation round trip"""
     if not ObjectId.is_valid(project_id):
         raise HTTPException(status_code=400, detail="Invalid project ID format")
-    
-    project_id_obj = ObjectId(project_id)
 
-    # Check if the project exists
-    project = await project_collection.find_one({"_id": project_id_obj})
-    if not project:
+    pipeline = [
+        {"$match": {"_id": ObjectId(project_id)}},
+        {"$lookup": {
+            "from": "project_modules",
+            "localField": "_id",
+            "foreignField": "projectId",
+            "pipeline": [{"$project": {"moduleName": 1, "description": 1, "estimatedHours": 1, "status": 1, "startDate": 1}}],
+            "as": "modules"
+        }},
+        {"$lookup": {
+            "from": "tasks",
+            "localField": "_id",
+            "foreignField": "project_id",
+            "pipeline": [{"$facet": {
+                "by_status": [{"$group": {"_id": "$status_id", "count": {"$sum": 1}}}],
+                "by_priority": [{"$group": {"_id": "$priority", "count": {"$sum": 1}}}],
+                "totals": [{"$group": {"_id": None, "count": {"$sum": 1}, "minutes": {"$sum": "$totalMinutes"}}}]
+            }}],
+            "as": "task_stats"
+        }},
+        {"$lookup": {
+            "from": "project_teams",
+            "localField": "_id",
+            "foreignField": "projectId",
+            "as": "team"
+        }},
+        {"$lookup": {
+            "from": "users",
+            "localField": "team.developers",
+            "foreignField": "_id",
+            "pipeline": [{"$project": {"firstname": 1, "email": 1}}],
+            "as": "developers"
+        }},
+        {"$project": {"team": 0}}
+    ]
+    results = await project_collection.aggregate(pipeline).to_list(1)
+    if not results:
         raise HTTPException(status_code=404, detail="Project not found")
-    
-    # Step 1: Fetch all related task IDs
-    task_ids = await tasks_collection.find({"project_id": project_id_obj}, {"_id": 1}).to_list(None)
-    task_id_list = [task["_id"] for task in task_ids]  
 
-    # Step 2: Delete related tasks
-    if task_id_list:
-        await tasks_collection.delete_many({"_id": {"$in": task_id_list}})
-    
-    # Step 3: Remove tasks from user_task_collection
-    if task_id_list:
-        await user_task_collection.delete_many({"taskId": {"$in": task_id_list}}
+    dashboard = results[0]
+    stats = dashboard.pop("task_stats")[0]
+    totals = stats["totals"][0] if stats["totals"] else {"count": 0, "minutes": 0}
+
+    # Status names come from the in-process status cache
+    tasks_by_status = []
+    for group in stats["by_status"]:
+        status = await find_status_by_id(group["_id"]) if group["_id"] else None
+        tasks_by_status.append({
+            "status_id": group["_id"],
+            "status": status["status"] if status else None,
+            "count": group["count"]
+        })
+
+    project = {key: value for key, value in dashboard.items() if key not in ("modules", "developers")}
+
+    return {
+        "project": project,
+        "modules": dashboard["modules"],
+        "developers": dashboard["developers"],
+        "tasks": {
+            "total": totals["count"],
+            "by_status": tasks_by_status,
+            "by_priority": {group["_id"]: group["count"] for group in stats["by_priority"]}
+        },
+        "logged_minutes": totals["minutes"],
+        "estimated_minutes": (project.get("estimatedHours") or 0) * 60
+    }
+
+async def _cascade_delete_project(project_id_obj: ObjectId, session=None):
+    """Deletes everything that belongs to a project. The project document goes last,
+    so a run that stops halfway can simply be repeated to finish the job."""
+    deleted = {"user_tasks": 0, "tasks": 0, "modules": 0, "project_teams": 0, "users_updated": 0, "project": 0}
+
+    # Steps 1-2: Delete tasks and their assignments in batches
+    # (user_tasks.taskId may be stored as a string or an ObjectId)
+    while True:
+        task_ids = await tasks_collection.find(
+            {"project_id": project_id_obj}, {"_id": 1}, session=session
+        ).limit(CASCADE_BATCH_SIZE).to_list(CASCADE_BATCH_SIZE)
+        if not task_ids:
+            break
+        task_id_list = [task["_id"] for task in task_ids]
+
+        result = await user_task_collection.delete_many(
+            {"taskId": {"$in": task_id_list + [str(task_id) for task_id in task_id_list]}}, session=session
         )
+        deleted["user_tasks"] += result.deleted_count
 
-    # Step 4: Delete related modules
-    await project_modules_collection.delete_many({"projectId": project_id_obj})
+        result = await tasks_collection.delete_many({"_id": {"$in": task_id_list}}, session=session)
+        deleted["tasks"] += result.deleted_count
 
-    # Step 5: Delete related team assignments
-    await project_team_collection.delete_many({"projectId": project_id_obj})
+    # Step 3: Delete related modules
+    result = await project_modules_collection.delete_many({"projectId": project_id_obj}, session=session)
+    deleted["modules"] = result.deleted_count
 
-    # Step 6: Remove assigned developers from the project
-    await project_team_collection.update_many(
-        {"project_id": project_id_obj},
-        {"$pull": {"developers": {"$exists": True}}}
-    )
+    # Step 4: Delete related team assignments
+    result = await project_team_collection.delete_many({"projectId": project_id_obj}, session=session)
+    deleted["project_teams"] = result.deleted_count
 
-    # Step 7: Remove project references from users
-    await user_collection.update_many(
-        {},  # Match all users
-        {"$pull": {"projects": str(project_id_obj)}}
+    # Step 5: Remove project references, only from users that have one
+    project_refs = [project_id_obj, str(project_id_obj)]
+    result = await user_collection.update_many(
+        {"projects": {"$in": project_refs}},
+        {"$pull": {"projects": {"$in": project_refs}}},
+        session=session
     )
+    deleted["users_updated"] = result.modified_count
+
+    # Step 6: Finally, delete the project itself
+    result = await project_collection.delete_one({"_id": project_id_obj}, session=session)
+    deleted["project"] = result.deleted_count
 
-    # Step 8: Finally, delete the project itself
-    result = await project_collection.delete_one({"_id": project_id_obj})
+    return deleted
+
+async def delete_project(project_id: str):
+    # Validate project_id
+    if not ObjectId.is_valid(project_id):
+        raise HTTPException(status_code=400, detail="Invalid project ID format")
     
-    if result.deleted_count == 0:
+    project_id_obj = ObjectId(project_id)
+
+    # Check if the project exists
+    project = await project_collection.find_one({"_id": project_id_obj}, {"_id": 1})
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    task_count = await tasks_collection.count_documents({"project_id": project_id_obj})
+
+    deleted = None
+    if task_count <= CASCADE_TRANSACTION_MAX_TASKS:
+        try:
+            async with await client.start_session() as session:
+                async with session.start_transaction():
+                    deleted = await _cascade_delete_project(project_id_obj, session)
+        except OperationFailure as e:
+            # Standalone mongod has no transactions, fall back to the resumable path
+            if e.code != ILLEGAL_OPERATION:
+                raise HTTPException(status_code=500, detail=f"Failed to delete project: {str(e)}")
+
+    # Very large projects (or no transaction support): ordered, repeatable deletes
+    if deleted is None:
+        deleted = await _cascade_delete_project(project_id_obj)
+
+    await project_cache.invalidate(project_id_obj)
+    if deleted["project"] == 0:
         raise HTTPException(status_code=500, detail="Failed to delete project")
+    await bump_versions("projects", tasks_scope(project_id_obj), modules_scope(project_id_obj))
     
-    return {"message": "Project and all related data deleted successfully"}
\ No newline at end of file
+    return {"message": "Project and all related data deleted successfully", "deleted": deleted}
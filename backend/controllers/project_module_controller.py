@@ -1,7 +1,9 @@
 from fastapi import HTTPException
 from bson import ObjectId
-from config.database import project_modules_collection,project_collection
-from models.project_module_model import ProjectModule,ProjectModuleOut
+from config.database import project_modules_collection
+from models.project_module_model import ProjectModule
+from utils.ETagUtil import bump_versions, modules_scope
+from utils.ProjectCacheUtil import project_cache
 from typing import List
 
 async def create_project_module(module: ProjectModule):
@@ -9,12 +11,13 @@ async def create_project_module(module: ProjectModule):
     module_dict['projectId'] = ObjectId(module_dict['projectId'])
 
     # Fetch project name using projectId
-    project = await project_collection.find_one({"_id": module_dict["projectId"]})
+    project = await project_cache.get(module_dict["projectId"])
     module_dict["project_name"] = project["title"] if project else "Unknown"
 
     result = await project_modules_collection.insert_one(module_dict)
     if not result.inserted_id:
         raise HTTPException(status_code=500, detail="Failed to create module")
+    await bump_versions(modules_scope(module_dict["projectId"]))
     
     module_dict["_id"] = str(result.inserted_id)
     module_dict["projectId"] = str(module_dict["projectId"])
@@ -28,7 +31,7 @@ async def get_project_module(module_id: str):
 
     # Fetch project name using projectId
     if "projectId" in module:
-        project = await project_collection.find_one({"_id": module["projectId"]})
+        project = await project_cache.get(module["projectId"])
         module["project_name"] = project["title"] if project else "Unknown"
 
     # Convert ObjectId fields to string before returning
@@ -54,7 +57,7 @@ async def update_project_module(module_id: str, module: ProjectModule):
             raise HTTPException(status_code=404, detail="Module not found")
 
         # Fetch project name using projectId
-        project = await project_collection.find_one({"_id": module_dict["projectId"]})
+        project = await project_cache.get(module_dict["projectId"])
         if not project:
             raise HTTPException(status_code=404, detail="Project not found")
         
@@ -68,6 +71,7 @@ async def update_project_module(module_id: str, module: ProjectModule):
 
         if result.modified_count == 0:
             raise HTTPException(status_code=400, detail="No changes were made to the module")
+        await bump_versions(modules_scope(existing_module.get("projectId")), modules_scope(module_dict["projectId"]))
 
         # Convert ObjectId fields back to string before returning
         module_dict["_id"] = str(module_id)
@@ -80,24 +84,22 @@ async def update_project_module(module_id: str, module: ProjectModule):
         raise HTTPException(status_code=500, detail=str(e))
 
 async def delete_project_module(module_id: str):
-    result = await project_modules_collection.delete_one({"_id": ObjectId(module_id)})
-    if result.deleted_count == 0:
+    deleted_module = await project_modules_collection.find_one_and_delete({"_id": ObjectId(module_id)}, projection={"projectId": 1})
+    if not deleted_module:
         raise HTTPException(status_code=404, detail="Module not found")
+    await bump_versions(modules_scope(deleted_module.get("projectId")))
     return {"message": "Module deleted successfully"}
 
-async def get_modules_by_project(project_id: str) -> List[ProjectModuleOut]:
+async def get_modules_by_project(project_id: str) -> List[dict]:
     # Fetch project to get project name
-    project = await project_collection.find_one({"_id": ObjectId(project_id)})
+    project = await project_cache.get(project_id)
     project_name = project["title"] if project else "Unknown"
 
     # Fetch modules belonging to the project
     modules = await project_modules_collection.find({"projectId": ObjectId(project_id)}).to_list(None)
 
-    # Convert ObjectId fields and include project name
+    # Include project name, ObjectIds are encoded by MongoJSONResponse
     for module in modules:
-        module["_id"] = str(module["_id"])
-        module["projectId"] = str(module["projectId"])
-        module["status"] = str(module["status"]) if "status" in module else None
         module["project_name"] = project_name  # Add project name to each module
 
-    return [ProjectModuleOut(**module) for module in modules]
\ No newline at end of file
+    return modules
\ No newline at end of file
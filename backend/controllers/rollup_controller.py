@@ -0,0 +1,99 @@
+from config.database import project_collection, project_modules_collection, tasks_collection, status_collection
+from controllers.status_controller import find_status_by_id
+from utils.ETagUtil import bump_versions, modules_scope
+from pymongo import UpdateOne
+from bson import ObjectId
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Tasks in these statuses count towards completedMinutes
+COMPLETED_STATUSES = {"Completed", "Done"}
+
+# Effort rollups stored on project and module documents:
+# rollup: {taskCount, totalMinutes, completedMinutes, statusCounts: {<status_id>: n}}
+
+async def _task_delta(task: dict, sign: int):
+    minutes = task.get("totalMinutes") or 0
+    status_id = task.get("status_id")
+    status = await find_status_by_id(status_id) if status_id else None
+    completed = bool(status and status.get("status") in COMPLETED_STATUSES)
+
+    delta = {
+        "rollup.taskCount": sign,
+        "rollup.totalMinutes": sign * minutes,
+        "rollup.completedMinutes": sign * minutes if completed else 0,
+    }
+    if status_id:
+        delta[f"rollup.statusCounts.{status_id}"] = sign
+    return delta
+
+def _merge(target: dict, key, delta: dict):
+    current = target.setdefault(key, {})
+    for field, value in delta.items():
+        current[field] = current.get(field, 0) + value
+
+async def apply_task_rollup(old_task: dict = None, new_task: dict = None):
+    """Moves a task's contribution from its old state to its new one with atomic $inc updates.
+    Pass old_task=None for a created task and new_task=None for a deleted one."""
+    projects, modules = {}, {}
+    for task, sign in ((old_task, -1), (new_task, 1)):
+        if not task:
+            continue
+        delta = await _task_delta(task, sign)
+        if task.get("project_id"):
+            _merge(projects, task["project_id"], delta)
+        if task.get("module_id"):
+            _merge(modules, task["module_id"], delta)
+
+    for collection, deltas in ((project_collection, projects), (project_modules_collection, modules)):
+        for doc_id, delta in deltas.items():
+            delta = {field: value for field, value in delta.items() if value}
+            if delta:
+                await collection.update_one({"_id": ObjectId(doc_id)}, {"$inc": delta})
+    if projects:
+        # Rollups are part of the project list and the module status board
+        await bump_versions("projects", *(modules_scope(project_id) for project_id in projects))
+
+async def repair_rollups(project_id: ObjectId = None):
+    """Recomputes every rollup from the tasks collection."""
+    completed_ids = [status["_id"] for status in await status_collection.find({"status": {"$in": list(COMPLETED_STATUSES)}}).to_list(None)]
+    match = {"project_id": project_id} if project_id else {}
+
+    repaired = {}
+    for collection, field in ((project_collection, "project_id"), (project_modules_collection, "module_id")):
+        pipeline = [
+            {"$match": match},
+            {"$group": {
+                "_id": {"owner": f"${field}", "status": "$status_id"},
+                "count": {"$sum": 1},
+                "minutes": {"$sum": {"$ifNull": ["$totalMinutes", 0]}}
+            }}
+        ]
+        rollups = {}
+        async for group in tasks_collection.aggregate(pipeline):
+            owner, status_id = group["_id"].get("owner"), group["_id"].get("status")
+            if owner is None:
+                continue
+            rollup = rollups.setdefault(owner, {"taskCount": 0, "totalMinutes": 0, "completedMinutes": 0, "statusCounts": {}})
+            rollup["taskCount"] += group["count"]
+            rollup["totalMinutes"] += group["minutes"]
+            if status_id in completed_ids:
+                rollup["completedMinutes"] += group["minutes"]
+            if status_id is not None:
+                rollup["statusCounts"][str(status_id)] = group["count"]
+
+        # Documents without tasks get an empty rollup
+        owner_filter = {"_id": project_id} if project_id and field == "project_id" else ({"projectId": project_id} if project_id else {})
+        empty = {"taskCount": 0, "totalMinutes": 0, "completedMinutes": 0, "statusCounts": {}}
+        operations = [
+            UpdateOne({"_id": doc["_id"]}, {"$set": {"rollup": rollups.get(doc["_id"], empty)}})
+            async for doc in collection.find(owner_filter, {"_id": 1})
+        ]
+        if operations:
+            await collection.bulk_write(operations, ordered=False)
+        repaired[collection.name] = len(operations)
+
+    await bump_versions("projects", modules_scope(project_id) if project_id else None)
+    logger.info(f"Rollups repaired: {repaired}")
+    return repaired
@@ -0,0 +1,97 @@
+from config.database import user_collection, project_collection, project_modules_collection, tasks_collection, project_team_collection
+from fastapi import HTTPException
+from bson import ObjectId
+from utils.PaginationUtil import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from typing import List, Optional
+
+# type -> (collection, project field used for scoping, title field, text field)
+SEARCH_TYPES = {
+    "project": (project_collection, "_id", "title", "description"),
+    "module": (project_modules_collection, "projectId", "moduleName", "description"),
+    "task": (tasks_collection, "project_id", "title", "description"),
+}
+# Tie-break order between types when scores are equal
+TYPE_ORDER = list(SEARCH_TYPES)
+
+def _encode_cursor(item):
+    return f"{item['score']!r}:{item['type']}:{item['id']}"
+
+def _decode_cursor(after: str):
+    try:
+        score, type_, doc_id = after.split(":")
+        return float(score), TYPE_ORDER.index(type_), ObjectId(doc_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor format")
+
+def _after_clause(type_rank: int, after):
+    """Documents that sort after the cursor in (score desc, type, _id) order."""
+    if not after:
+        return {}
+    score, cursor_rank, cursor_id = after
+    if type_rank < cursor_rank:
+        return {"score": {"$lt": score}}
+    if type_rank > cursor_rank:
+        return {"score": {"$lte": score}}
+    return {"$or": [{"score": {"$lt": score}}, {"score": score, "_id": {"$gt": cursor_id}}]}
+
+async def _visible_project_ids(user_id: str):
+    """None means every project is visible (admins)."""
+    if not ObjectId.is_valid(user_id):
+        raise HTTPException(status_code=400, detail="Invalid user ID format")
+
+    user = await user_collection.find_one({"_id": ObjectId(user_id)}, {"role": 1, "email": 1})
+    if not user:
+        raise HTTPException(status_code=401, detail="Unauthorized: unknown user")
+
+    if user["role"] == "admin":
+        return None
+    if user["role"] == "manager":
+        projects = await project_collection.find({"manager_email": user["email"]}, {"_id": 1}).to_list(None)
+        return [project["_id"] for project in projects]
+    teams = await project_team_collection.find({"developers": user["_id"]}, {"projectId": 1}).to_list(None)
+    return [team["projectId"] for team in teams]
+
+async def search(q: str, user_id: str, types: Optional[List[str]] = None, limit: int = DEFAULT_PAGE_SIZE, after: str = None):
+    """Ranked full-text search over projects, modules and tasks the user can see"""
+    if not q or not q.strip():
+        raise HTTPException(status_code=400, detail="Search query is required")
+
+    types = types or TYPE_ORDER
+    unknown = set(types) - set(SEARCH_TYPES)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown search types: {', '.join(sorted(unknown))}")
+
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    cursor = _decode_cursor(after) if after else None
+    visible_projects = await _visible_project_ids(user_id)
+
+    results = []
+    for type_ in types:
+        collection, project_field, title_field, text_field = SEARCH_TYPES[type_]
+        match = {"$text": {"$search": q}}
+        if visible_projects is not None:
+            match[project_field] = {"$in": visible_projects}
+
+        pipeline = [
+            {"$match": match},
+            {"$addFields": {"score": {"$meta": "textScore"}}},
+            {"$match": _after_clause(TYPE_ORDER.index(type_), cursor)},
+            {"$sort": {"score": -1, "_id": 1}},
+            {"$limit": limit + 1},
+            {"$project": {"score": 1, title_field: 1, text_field: 1, project_field: 1}}
+        ]
+        async for doc in collection.aggregate(pipeline):
+            results.append({
+                "type": type_,
+                "id": str(doc["_id"]),
+                "title": doc.get(title_field),
+                "description": doc.get(text_field),
+                "project_id": str(doc.get(project_field)) if doc.get(project_field) else None,
+                "score": doc["score"]
+            })
+
+    # Merge the per-type pages into one ranked page
+    results.sort(key=lambda item: (-item["score"], TYPE_ORDER.index(item["type"]), item["id"]))
+    page = results[:limit]
+    next_after = _encode_cursor(page[-1]) if len(results) > limit else None
+    return page, next_after
@@ -3,17 +3,60 @@ from config.database import status_collection
 from fastapi import HTTPException
 from bson import ObjectId
 from controllers.project_module_controller import get_modules_by_project
+from utils.ETagUtil import bump_versions
+import asyncio
+
+# In-process cache of the status catalogue. The collection is tiny and rarely
+# changes, so it is loaded once and invalidated by the write functions below.
+_status_cache = {"by_id": None, "by_name": None, "generation": 0}
+_status_cache_lock = asyncio.Lock()
+
+async def _get_status_catalogue():
+    if _status_cache["by_id"] is not None:
+        return _status_cache
+
+    async with _status_cache_lock:
+        if _status_cache["by_id"] is None:
+            generation = _status_cache["generation"]
+            statuses = await status_collection.find().to_list(None)
+            # Skip storing if a write invalidated the cache while we were loading
+            if generation == _status_cache["generation"]:
+                _status_cache["by_id"] = {str(status["_id"]): status for status in statuses}
+                _status_cache["by_name"] = {status.get("status"): status for status in statuses}
+            else:
+                return {"by_id": {str(status["_id"]): status for status in statuses},
+                        "by_name": {status.get("status"): status for status in statuses}}
+    return _status_cache
+
+def invalidate_status_cache():
+    _status_cache["by_id"] = None
+    _status_cache["by_name"] = None
+    _status_cache["generation"] += 1
+
+async def find_status_by_id(status_id):
+    """Cached lookup by id. Returns a copy of the raw document or None."""
+    catalogue = await _get_status_catalogue()
+    status = catalogue["by_id"].get(str(status_id))
+    return dict(status) if status else None
+
+async def find_status_by_name(name: str):
+    """Cached lookup by status name. Returns a copy of the raw document or None."""
+    catalogue = await _get_status_catalogue()
+    status = catalogue["by_name"].get(name)
+    return dict(status) if status else None
 
 async def create_status(status:Status):
     status_data = status.dict()
 
     status_ = await status_collection.insert_one(status_data)
+    invalidate_status_cache()
+    await bump_versions("status")
     status_data["_id"] = str(status_.inserted_id)
     
     return StatusOut(**status_data)
 
 async def get_status(status_id: str):
-    status = await status_collection.find_one({"_id": ObjectId(status_id)})
+    status = await find_status_by_id(status_id)
     if not status:
         raise HTTPException(status_code=404, detail="status not found")
     
@@ -21,13 +64,13 @@ async def get_status(status_id: str):
     return StatusOut(**status)
 
 async def get_all_status():
-    statuses = await status_collection.find().to_list(None)  # Fetch all statuses
-    for status in statuses:
-        status["_id"] = str(status["_id"])
-    return statuses
+    catalogue = await _get_status_catalogue()
+    return [{**status, "_id": str(status["_id"])} for status in catalogue["by_id"].values()]
 
 async def delete_status(status_id: str):
     result = await status_collection.delete_one({"_id": ObjectId(status_id)})
+    invalidate_status_cache()
+    await bump_versions("status")
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="status not found")
     return {"message": "status deleted successfully"}
@@ -52,6 +95,8 @@ async def update_status(status_id: str, status: Status):
         {"_id": status_id}, 
         {"$set": status_data}
     )
+    invalidate_status_cache()
+    await bump_versions("status")
 
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Status not found")
@@ -1,16 +1,56 @@
-from models.task_model import Task, TaskOut
-from config.database import user_task_collection,tasks_collection,project_collection,status_collection
+from models.task_model import Task
+from config.database import user_task_collection,tasks_collection,project_collection,project_modules_collection
 from controllers.project_module_controller import get_modules_by_project
-from controllers.status_controller import get_all_status
-from fastapi import HTTPException,UploadFile,File,Form
-from utils.CloudinaryUtil import upload_image
-from typing import Optional
+from controllers.status_controller import get_all_status, find_status_by_id
+from controllers.rollup_controller import apply_task_rollup, repair_rollups
+from fastapi import HTTPException,UploadFile,File,Form,BackgroundTasks
+from fastapi.responses import StreamingResponse
+from utils.CloudinaryUtil import upload_image, save_upload
+from utils.ETagUtil import bump_versions, tasks_scope
+from utils.ChangeStreamUtil import change_hub, sse_events
+from utils.ProjectCacheUtil import project_cache
+from typing import List, Optional
 from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError
+import asyncio
+import csv
+import io
+import json
+import logging
 import os
-import shutil
+
+logger = logging.getLogger(__name__)
 
 
 UPLOAD_DIR = "../UPLOADS"
+EXPORT_BATCH_SIZE = 500
+EXPORT_FIELDS = ["_id", "title", "priority", "description", "totalMinutes", "module_id", "project_id", "status_id", "ui_image_url"]
+IMPORT_CHUNK_SIZE = 1000
+IMPORT_MAX_ROWS = int(os.getenv("IMPORT_MAX_ROWS", 50000))
+IMPORT_FIELDS = ["title", "priority", "description", "totalMinutes", "module_id", "project_id", "status_id"]
+
+async def upload_task_image(task_id: ObjectId, file_path: str):
+    """Background job: push a saved image to Cloudinary and fill in the task's image URL"""
+    try:
+        image_url = await upload_image(file_path)
+        update = {"ui_image_url": image_url, "image_status": "uploaded"}
+    except Exception as e:
+        logger.error(f"Image upload failed for task {task_id}: {e}")
+        update = {"image_status": "failed"}
+    finally:
+        if os.path.exists(file_path):
+            await asyncio.to_thread(os.remove, file_path)
+
+    task = await tasks_collection.find_one_and_update({"_id": task_id}, {"$set": update}, projection={"project_id": 1})
+    if task:
+        await bump_versions(tasks_scope(task.get("project_id")))
+
+async def schedule_task_image_upload(background_tasks: Optional[BackgroundTasks], task_id: ObjectId, file_path: str):
+    if background_tasks is not None:
+        background_tasks.add_task(upload_task_image, task_id, file_path)
+    else:
+        await upload_task_image(task_id, file_path)
 
 async def create_task(
     title: str = Form(...),
@@ -20,13 +60,14 @@ async def create_task(
     module_id: str = Form(...),
     project_id: str = Form(...),
     status_id: str = Form(...),
-    image: Optional[UploadFile] = File(None)
+    image: Optional[UploadFile] = File(None),
+    background_tasks: Optional[BackgroundTasks] = None
 ):
-    """Create a new task"""
+    """Create a new task. The image, if any, is uploaded after the task is created."""
     if not ObjectId.is_valid(module_id) or not ObjectId.is_valid(project_id) or not ObjectId.is_valid(status_id):
         raise HTTPException(status_code=400, detail="Invalid ObjectId format")
     
-    project = await project_collection.find_one({"_id": ObjectId(project_id)})
+    project = await project_cache.get(project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
@@ -41,27 +82,111 @@ async def create_task(
         "ui_image_url": None
     }
     
-    if image:
-        try:
-            file_ext = image.filename.split(".")[-1]
-            file_path = os.path.join(UPLOAD_DIR, f"{ObjectId()}.{file_ext}")
-            # Ensure the directory exists
-            os.makedirs(UPLOAD_DIR, exist_ok=True)
-        
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(image.file, buffer)
-            
-            if not file_ext.lower() in ["jpg", "jpeg", "png"]:
-             raise HTTPException(status_code=400, detail="Invalid image format")
-            
-            task_data["ui_image_url"] = await upload_image(file_path)
-
-            os.remove(file_path)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Image upload failed: {str(e)}")
+    file_path = None
+    if isinstance(image, UploadFile):
+        file_path = await save_upload(image, UPLOAD_DIR)
+        task_data["image_status"] = "pending"
     
     result = await tasks_collection.insert_one(task_data)
-    return {"message": "Task created successfully", "id": str(result.inserted_id), "image_url": task_data["ui_image_url"]}
+    await apply_task_rollup(None, task_data)
+    await bump_versions(tasks_scope(project_id))
+
+    if file_path:
+        await schedule_task_image_upload(background_tasks, result.inserted_id, file_path)
+
+    return {"message": "Task created successfully", "id": str(result.inserted_id), "image_url": task_data["ui_image_url"], "image_status": task_data.get("image_status")}
+
+def parse_task_csv(content: str) -> List[dict]:
+    return list(csv.DictReader(io.StringIO(content)))
+
+def _parse_import_row(row):
+    """Returns (task_data, error) for one import row; ids are only checked for format here."""
+    if not isinstance(row, dict):
+        return None, "Row must be an object"
+    missing = [field for field in IMPORT_FIELDS if row.get(field) in (None, "")]
+    if missing:
+        return None, f"Missing fields: {', '.join(missing)}"
+    if not all(ObjectId.is_valid(str(row[field])) for field in ("module_id", "project_id", "status_id")):
+        return None, "Invalid ObjectId format"
+    try:
+        total_minutes = int(row["totalMinutes"])
+    except (TypeError, ValueError):
+        return None, "totalMinutes must be an integer"
+
+    return {
+        "title": str(row["title"]),
+        "priority": str(row["priority"]),
+        "description": str(row["description"]),
+        "totalMinutes": total_minutes,
+        "module_id": ObjectId(str(row["module_id"])),
+        "project_id": ObjectId(str(row["project_id"])),
+        "status_id": ObjectId(str(row["status_id"])),
+        "ui_image_url": None
+    }, None
+
+async def import_tasks(rows: List[dict]):
+    """Bulk-create tasks. Invalid rows are reported instead of aborting the batch; rows are numbered from 1."""
+    if len(rows) > IMPORT_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {IMPORT_MAX_ROWS} rows per import")
+
+    errors = []
+    parsed = []
+    for row_number, row in enumerate(rows, start=1):
+        task_data, error = _parse_import_row(row)
+        if error:
+            errors.append({"row": row_number, "error": error})
+        else:
+            parsed.append((row_number, task_data))
+
+    # Validate every referenced project and module with one $in query each
+    project_ids = list({task["project_id"] for _, task in parsed})
+    module_ids = list({task["module_id"] for _, task in parsed})
+    existing_projects = {project["_id"] for project in await project_collection.find({"_id": {"$in": project_ids}}, {"_id": 1}).to_list(None)}
+    module_projects = {
+        module["_id"]: module.get("projectId")
+        for module in await project_modules_collection.find({"_id": {"$in": module_ids}}, {"projectId": 1}).to_list(None)
+    }
+
+    valid = []
+    for row_number, task in parsed:
+        if task["project_id"] not in existing_projects:
+            errors.append({"row": row_number, "error": "Project not found"})
+        elif task["module_id"] not in module_projects:
+            errors.append({"row": row_number, "error": "Module not found"})
+        elif module_projects[task["module_id"]] != task["project_id"]:
+            errors.append({"row": row_number, "error": "Module does not belong to project"})
+        elif not await find_status_by_id(task["status_id"]):
+            errors.append({"row": row_number, "error": "Status not found"})
+        else:
+            valid.append((row_number, task))
+
+    inserted_ids = []
+    for start in range(0, len(valid), IMPORT_CHUNK_SIZE):
+        chunk = valid[start:start + IMPORT_CHUNK_SIZE]
+        documents = [task for _, task in chunk]
+        try:
+            result = await tasks_collection.insert_many(documents, ordered=False)
+            inserted_ids.extend(result.inserted_ids)
+        except BulkWriteError as e:
+            failed = {error["index"] for error in e.details.get("writeErrors", [])}
+            for error in e.details.get("writeErrors", []):
+                errors.append({"row": chunk[error["index"]][0], "error": error.get("errmsg", "Insert failed")})
+            inserted_ids.extend(task["_id"] for index, task in enumerate(documents) if index not in failed)
+
+    # One recomputation per touched project instead of one $inc per task
+    touched_projects = {task["project_id"] for _, task in valid}
+    for project_id in touched_projects:
+        await repair_rollups(project_id)
+    await bump_versions(*(tasks_scope(project_id) for project_id in touched_projects))
+
+    errors.sort(key=lambda error: error["row"])
+    return {
+        "message": "Import finished",
+        "inserted": len(inserted_ids),
+        "failed": len(errors),
+        "ids": [str(task_id) for task_id in inserted_ids],
+        "errors": errors
+    }
 
 async def get_project_tasks(project_id: str):
     """Retrieve all tasks for a specific project"""
@@ -70,30 +195,72 @@ async def get_project_tasks(project_id: str):
     except Exception:  # Using generic Exception as InvalidId might not be recognized
         raise HTTPException(status_code=400, detail="Invalid ObjectId format")
 
-    tasks = await tasks_collection.find({"project_id": project_id}).to_list(None)
-    
-    # Convert _id and ensure all necessary fields are properly formatted
-    return [
-    TaskOut(
-        **{
-            **{k: v for k, v in task.items() if k != "image"},
-            "_id": str(task["_id"]),
-            "project_id": str(task.get("project_id", "")),
-            "image_url": task.get("ui_image_url", None)
-        }
+    # Raw documents, ObjectIds are encoded by MongoJSONResponse
+    return await tasks_collection.find({"project_id": project_id}).to_list(None)
+
+async def _export_rows(project_id: ObjectId, format: str):
+    cursor = tasks_collection.find(
+        {"project_id": project_id}, {field: 1 for field in EXPORT_FIELDS}
+    ).batch_size(EXPORT_BATCH_SIZE)
+
+    # One chunk per cursor batch instead of one socket write per task
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if format == "csv":
+        writer.writerow(EXPORT_FIELDS)
+
+    rows = 0
+    async for task in cursor:
+        row = {field: str(task[field]) if isinstance(task.get(field), ObjectId) else task.get(field) for field in EXPORT_FIELDS}
+        if format == "csv":
+            writer.writerow(row.values())
+        else:
+            buffer.write(json.dumps(row) + "\n")
+        rows += 1
+        if rows % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+async def export_project_tasks(project_id: str, format: str = "csv"):
+    """Stream all tasks of a project as CSV or NDJSON without loading them into memory"""
+    if not ObjectId.is_valid(project_id):
+        raise HTTPException(status_code=400, detail="Invalid ObjectId format")
+    if format not in ("csv", "ndjson"):
+        raise HTTPException(status_code=400, detail="format must be csv or ndjson")
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        _export_rows(ObjectId(project_id), format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="tasks-{project_id}.{format}"'}
+    )
+
+async def stream_project_events(request, project_id: str, last_event_id: Optional[str] = None):
+    """Push task, module and assignment changes of a project to a board as Server-Sent Events"""
+    if not ObjectId.is_valid(project_id):
+        raise HTTPException(status_code=400, detail="Invalid ObjectId format")
+
+    subscription = change_hub.subscribe(project_id, last_event_id)
+    return StreamingResponse(
+        sse_events(request, subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
-    for task in tasks
-]
 
 async def update_task(task_id: str, updated_task: Task = None, 
-                     title: str = Form(None),
-                     priority: str = Form(None),
-                     description: str = Form(None), 
-                     totalMinutes: int = Form(None),
-                     module_id: str = Form(None),
-                     project_id: str = Form(None),
-                     status_id: str = Form(None),
-                     image: Optional[UploadFile] = File(None)):
+                     title: str = None,
+                     priority: str = None,
+                     description: str = None, 
+                     totalMinutes: int = None,
+                     module_id: str = None,
+                     project_id: str = None,
+                     status_id: str = None,
+                     image: Optional[UploadFile] = None,
+                     background_tasks: Optional[BackgroundTasks] = None):
     """Update an existing task - supports both JSON and form data"""
     try:
         task_id = ObjectId(task_id)
@@ -112,7 +279,7 @@ async def update_task(task_id: str, updated_task: Task = None,
     if updated_task:
         try:
             # Print request data for debugging
-            print(f"Received update data: {updated_task.dict()}")
+            logger.debug(f"Received update data: {updated_task.dict()}")
             
             task_data = updated_task.dict(exclude_unset=True, exclude={"id", "image"})
             
@@ -146,37 +313,43 @@ async def update_task(task_id: str, updated_task: Task = None,
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Error processing form data: {str(e)}")
     
-    # Handle image upload in either case
-    if image:
-        try:
-            file_ext = image.filename.split(".")[-1]
-            file_path = os.path.join(UPLOAD_DIR, f"{ObjectId()}.{file_ext}")
-            os.makedirs(UPLOAD_DIR, exist_ok=True)
-        
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(image.file, buffer)
-            
-            if not file_ext.lower() in ["jpg", "jpeg", "png"]:
-                raise HTTPException(status_code=400, detail="Invalid image format")
-            
-            task_data["ui_image_url"] = await upload_image(file_path)
-            
-            os.remove(file_path)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Image upload failed: {str(e)}")
+    # Handle image upload in either case; the URL is filled in once the upload completes
+    file_path = None
+    if isinstance(image, UploadFile):
+        file_path = await save_upload(image, UPLOAD_DIR)
+        task_data["image_status"] = "pending"
     
     # Only update if there's data to update
     if not task_data:
         return {"message": "No changes to update"}
 
     try:
-        result = await tasks_collection.update_one({"_id": task_id}, {"$set": task_data})
+        # The pre-update document tells the rollups exactly what this write replaced
+        before = await tasks_collection.find_one_and_update(
+            {"_id": task_id}, {"$set": task_data}, return_document=ReturnDocument.BEFORE
+        )
+        if not before:
+            raise HTTPException(status_code=404, detail="Task not found")
+
+        if file_path:
+            await schedule_task_image_upload(background_tasks, task_id, file_path)
         
-        if result.modified_count == 0:
+        if all(before.get(key) == value for key, value in task_data.items()):
             # This might happen if the data is the same as existing
             return {"message": "No changes made to task"}
 
+        await apply_task_rollup(before, {**before, **task_data})
+        if task_data.get("project_id") and task_data["project_id"] != before.get("project_id"):
+            # Assignments carry a copy of the project id for the developer board
+            await user_task_collection.update_many(
+                {"taskId": {"$in": [task_id, str(task_id)]}},
+                {"$set": {"projectId": str(task_data["project_id"])}}
+            )
+        await bump_versions(tasks_scope(before.get("project_id")), tasks_scope(task_data.get("project_id")))
+
         return {"message": "Task updated successfully"}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database update error: {str(e)}")
     
@@ -187,11 +360,14 @@ async def delete_task(task_id: str):
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid ObjectId format")
 
-    result = await tasks_collection.delete_one({"_id": task_id})
+    deleted_task = await tasks_collection.find_one_and_delete({"_id": task_id})
 
-    if result.deleted_count == 0:
+    if not deleted_task:
         raise HTTPException(status_code=404, detail="Task not found")
 
+    await apply_task_rollup(deleted_task, None)
+    await bump_versions(tasks_scope(deleted_task.get("project_id")))
+
     return {"message": "Task deleted successfully"}
 
  
@@ -207,74 +383,71 @@ async def get_modules_and_statuses(project_id: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching modules and statuses: {str(e)}")
 
-async def get_tasks_for_developer(developer_id: str, project_id: str):
+async def get_tasks_for_developer(developer_id: str, project_id: str, status_id: Optional[str] = None, priority: Optional[str] = None):
     """Retrieve tasks for a developer in a specific project"""
-    try:
-        user_tasks_cursor = user_task_collection.find({"userId": developer_id})
-        user_tasks = await user_tasks_cursor.to_list(length=None)
-
-        if not user_tasks:
-            raise HTTPException(status_code=404, detail="No tasks found for this developer.")
-
-        # Extract task_ids and convert to ObjectId
-        task_ids = [ObjectId(user_task["taskId"]) for user_task in user_tasks if ObjectId.is_valid(user_task["taskId"])]
-
-        if not task_ids:
-            raise HTTPException(status_code=404, detail="No valid task IDs found.")
-
-        tasks_cursor = tasks_collection.find({"_id": {"$in": task_ids}})
-        tasks = await tasks_cursor.to_list(length=None)
-
-        if not tasks:
-            raise HTTPException(status_code=404, detail="No tasks found for the given task IDs.")
-
-        # Convert ObjectId to strings
-        filtered_tasks = []
-        for task in tasks:
-            task["_id"] = str(task["_id"])
-            task["project_id"] = str(task["project_id"])
-            task["module_id"] = str(task["module_id"]) if "module_id" in task else None
-            task["status_id"] = str(task["status_id"]) if "status_id" in task else None
-            filtered_tasks.append(task)
-
-        if not filtered_tasks:
-            raise HTTPException(status_code=404, detail="No tasks found for this developer in the specified project.")
+    if not ObjectId.is_valid(project_id) or (status_id and not ObjectId.is_valid(status_id)):
+        raise HTTPException(status_code=400, detail="Invalid ObjectId format")
 
-        return filtered_tasks
-    
-    except HTTPException:
-        raise
+    task_filter = {"project_id": ObjectId(project_id)}
+    if status_id:
+        task_filter["status_id"] = ObjectId(status_id)
+    if priority:
+        task_filter["priority"] = priority
+
+    # One round trip: user_tasks(userId, projectId) index, then an _id lookup per assignment
+    pipeline = [
+        {"$match": {"userId": developer_id, "projectId": project_id}},
+        {"$lookup": {
+            "from": "tasks",
+            "let": {"task_id": {"$convert": {"input": "$taskId", "to": "objectId", "onError": None, "onNull": None}}},
+            "pipeline": [
+                {"$match": {"$expr": {"$eq": ["$_id", "$$task_id"]}}},
+                {"$match": task_filter}
+            ],
+            "as": "task"
+        }},
+        {"$unwind": "$task"},
+        {"$replaceRoot": {"newRoot": "$task"}}
+    ]
 
+    try:
+        tasks = await user_task_collection.aggregate(pipeline).to_list(length=None)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
 
+    if not tasks:
+        raise HTTPException(status_code=404, detail="No tasks found for this developer in the specified project.")
+
+    return tasks
+
 async def get_task_status(task_id: str):
     """Retrieve the status of a task"""
     task = await tasks_collection.find_one({"_id": ObjectId(task_id)})
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    status = await status_collection.find_one({"_id": ObjectId(task["status_id"])})
+    status = await find_status_by_id(task["status_id"])
     if not status:
         raise HTTPException(status_code=404, detail="Status not found")
 
-    return {"status_id": str(status["_id"]), "status_name": status["statusName"]}
+    return {"status_id": str(status["_id"]), "status_name": status["status"]}
 
 async def update_task_status(task_id: str, status_id: str):
     """Update the status of a task"""
-    task = await tasks_collection.find_one({"_id": ObjectId(task_id)})
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-
-    status = await status_collection.find_one({"_id": ObjectId(status_id)})
+    status = await find_status_by_id(status_id)
     if not status:
         raise HTTPException(status_code=404, detail="Status not found")
 
-    result = await tasks_collection.update_one(
-        {"_id": ObjectId(task_id)}, {"$set": {"status_id": ObjectId(status_id)}}
+    before = await tasks_collection.find_one_and_update(
+        {"_id": ObjectId(task_id)}, {"$set": {"status_id": ObjectId(status_id)}}, return_document=ReturnDocument.BEFORE
     )
+    if not before:
+        raise HTTPException(status_code=404, detail="Task not found")
 
-    if result.modified_count == 0:
+    if before.get("status_id") == ObjectId(status_id):
         raise HTTPException(status_code=400, detail="Failed to update task status")
 
+    await apply_task_rollup(before, {**before, "status_id": ObjectId(status_id)})
+    await bump_versions(tasks_scope(before.get("project_id")))
+
     return {"message": "Task status updated successfully", "task_id": task_id, "status_id": status_id}
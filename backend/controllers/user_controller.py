@@ -1,8 +1,9 @@
 from models.user_model import UserRegister, UserLogin
-from config.database import user_collection
+from config.database import user_collection, listing_collection
 from fastapi import HTTPException
 import bson
-import bcrypt
+from utils.PaginationUtil import paginate, DEFAULT_PAGE_SIZE
+from auth.auth import hash_password_async, verify_and_update_password
 
 async def user_register(user: UserRegister):
     # Check if email already exists
@@ -11,7 +12,7 @@ async def user_register(user: UserRegister):
         raise HTTPException(status_code=400, detail="Email already registered")
 
     # Hash password before storing it
-    hashed_password = bcrypt.hashpw(user.password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    hashed_password = await hash_password_async(user.password)
 
     user_data = {
         "firstname": user.firstname,
@@ -30,12 +31,17 @@ async def user_login(user: UserLogin):
     if not existing_user:
         raise HTTPException(status_code=404, detail="Invalid email or password")
 
-    stored_password = existing_user["password"].encode("utf-8")  # Stored hashed password
+    stored_password = existing_user["password"]  # Stored hashed password
 
     # Compare input password (plain text) with stored hashed password
-    if not bcrypt.checkpw(user.password.encode("utf-8"), stored_password):
+    valid, new_hash = await verify_and_update_password(user.password, stored_password)
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
+    # Work factor changed since this hash was created, store an upgraded hash
+    if new_hash:
+        await user_collection.update_one({"_id": existing_user["_id"]}, {"$set": {"password": new_hash}})
+
     return {"message": "Login successful", "user_id": str(existing_user["_id"]),"role":existing_user["role"],"name":existing_user["firstname"]}
 
 async def user_delete(email: str, admin_id: str):
@@ -60,6 +66,6 @@ async def user_delete(email: str, admin_id: str):
     
     return {"message": "User deleted successfully", "user_id": str(existing_user["_id"])}
 
-async def get_all_users():
-    users = await user_collection.find().to_list(length=None)  
-    return [{"id": str(user["_id"]), "firstname": user["firstname"], "role": user["role"], "email": user["email"]} for user in users]
\ No newline at end of file
+async def get_all_users(limit: int = DEFAULT_PAGE_SIZE, after: str = None):
+    users, next_after = await paginate(listing_collection('users'), {}, {"firstname": 1, "role": 1, "email": 1}, limit, after)
+    return [{"id": user["_id"], "firstname": user["firstname"], "role": user["role"], "email": user["email"]} for user in users], next_after
@@ -1,8 +1,18 @@
 from fastapi import HTTPException
 from bson import ObjectId
-from config.database import user_collection,user_task_collection,status_collection,tasks_collection
-from models.user_task_model import UserTask
-from controllers.email_controller import send_task_assignment_email, send_task_removal_email
+from config.database import user_collection,user_task_collection,tasks_collection
+from models.user_task_model import UserTask, BulkUserTask
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from controllers.status_controller import find_status_by_name
+from controllers.rollup_controller import apply_task_rollup, repair_rollups
+from controllers.email_controller import send_task_assignment_email, send_task_removal_email, send_bulk_task_assignment_email
+from utils.ETagUtil import bump_versions, tasks_scope
+import logging
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_KEY = 11000
 
 # Assign a task to a user
 async def assign_task(user_task: UserTask):
@@ -16,25 +26,99 @@ async def assign_task(user_task: UserTask):
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    assigned_status = await status_collection.find_one({"status": "Assigned"})
+    assigned_status = await find_status_by_name("Assigned")
     if not assigned_status:
         raise HTTPException(status_code=404, detail="Assigned status not found")
 
 
-    # Insert into user_tasks collection
-    result = await user_task_collection.insert_one(user_task.dict())
+    # Insert into user_tasks collection; projectId lets a developer's board be queried per project
+    try:
+        result = await user_task_collection.insert_one({**user_task.dict(), "projectId": str(task["project_id"])})
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Task already assigned to this user")
 
-    await tasks_collection.update_one(
-        {"_id": ObjectId(user_task.taskId)},
-        {"$set": {"statusId": assigned_status["_id"]}}
-    )
+    if task.get("status_id") != assigned_status["_id"]:
+        await tasks_collection.update_one(
+            {"_id": ObjectId(user_task.taskId)},
+            {"$set": {"status_id": assigned_status["_id"]}}
+        )
+        await apply_task_rollup(task, {**task, "status_id": assigned_status["_id"]})
+        await bump_versions(tasks_scope(task["project_id"]))
 
     # Send Email Notification
-    print("sending email.....")
+    logger.info(f"Queueing task assignment email for user {user_task.userId}")
     await send_task_assignment_email(user, task)
 
     return {"message": "Task assigned successfully", "user_task_id": str(result.inserted_id)}
 
+# Assign many user/task pairs at once
+async def assign_tasks_bulk(bulk: BulkUserTask):
+    # Drop repeated pairs and reject malformed ids up front
+    pairs = list(dict.fromkeys((a.userId, a.taskId) for a in bulk.assignments))
+    invalid = [{"userId": u, "taskId": t} for u, t in pairs if not ObjectId.is_valid(u) or not ObjectId.is_valid(t)]
+    if invalid:
+        raise HTTPException(status_code=400, detail={"message": "Invalid ObjectId format", "assignments": invalid})
+
+    # Validate users and tasks with one query each
+    user_ids = list({ObjectId(u) for u, _ in pairs})
+    task_ids = list({ObjectId(t) for _, t in pairs})
+    users = {str(user["_id"]): user for user in await user_collection.find({"_id": {"$in": user_ids}}, {"firstname": 1, "email": 1}).to_list(None)}
+    tasks = {str(task["_id"]): task for task in await tasks_collection.find({"_id": {"$in": task_ids}}).to_list(None)}
+
+    missing_users = sorted({u for u, _ in pairs if u not in users})
+    missing_tasks = sorted({t for _, t in pairs if t not in tasks})
+    if missing_users or missing_tasks:
+        raise HTTPException(status_code=404, detail={"message": "Users or tasks not found", "users": missing_users, "tasks": missing_tasks})
+
+    assigned_status = await find_status_by_name("Assigned")
+    if not assigned_status:
+        raise HTTPException(status_code=404, detail="Assigned status not found")
+
+    # Upserts make re-sent pairs a no-op; the unique (userId, taskId) index covers concurrent calls
+    operations = [
+        UpdateOne(
+            {"userId": u, "taskId": t},
+            {"$setOnInsert": {"userId": u, "taskId": t, "projectId": str(tasks[t]["project_id"])}},
+            upsert=True
+        )
+        for u, t in pairs
+    ]
+    try:
+        result = await user_task_collection.bulk_write(operations, ordered=False)
+        upserted = result.upserted_ids
+    except BulkWriteError as e:
+        # A concurrent call inserted some of the same pairs first; those count as already assigned
+        if any(error.get("code") != DUPLICATE_KEY for error in e.details.get("writeErrors", [])):
+            raise
+        upserted = {item["index"]: item["_id"] for item in e.details.get("upserted", [])}
+    new_pairs = [pairs[index] for index in upserted]
+
+    status_updates = [
+        UpdateOne({"_id": task["_id"]}, {"$set": {"status_id": assigned_status["_id"]}})
+        for task in {tasks[t]["_id"]: tasks[t] for _, t in new_pairs}.values()
+        if task.get("status_id") != assigned_status["_id"]
+    ]
+    if status_updates:
+        await tasks_collection.bulk_write(status_updates, ordered=False)
+        touched_projects = {tasks[t]["project_id"] for _, t in new_pairs}
+        for project_id in touched_projects:
+            await repair_rollups(project_id)
+        await bump_versions(*(tasks_scope(project_id) for project_id in touched_projects))
+
+    # One consolidated email per recipient
+    tasks_by_user = {}
+    for u, t in new_pairs:
+        tasks_by_user.setdefault(u, []).append(tasks[t])
+    for u, user_tasks in tasks_by_user.items():
+        await send_bulk_task_assignment_email(users[u], user_tasks)
+
+    return {
+        "message": "Tasks assigned successfully",
+        "assigned": len(new_pairs),
+        "skipped_duplicates": len(pairs) - len(new_pairs),
+        "notified_users": len(tasks_by_user)
+    }
+
 # Get all tasks assigned to a user
 async def get_user_tasks(user_id: str):
     tasks_cursor = user_task_collection.find({"userId": user_id})
@@ -43,11 +127,13 @@ async def get_user_tasks(user_id: str):
     if not tasks:
         raise HTTPException(status_code=404, detail="No tasks found for this user")
 
+    # Every assignment belongs to the same user, so fetch the user details once
+    user = None
+    if ObjectId.is_valid(user_id):
+        user = await user_collection.find_one({"_id": ObjectId(user_id)}, {"firstname": 1, "lastname": 1})
+
     for task in tasks:
         task["_id"] = str(task["_id"])
-
-        # Fetch user details for assigned user
-        user = await user_collection.find_one({"_id": ObjectId(task["userId"])})
         if user:
             task["assignedTo"] = f"{user.get('firstname', '')} {user.get('lastname', '')}"
 
@@ -62,9 +148,14 @@ async def get_users_by_task(task_id: str):
     if not user_tasks:
         raise HTTPException(status_code=404, detail="No users found for this task")
 
+    # Fetch all assigned users in a single query instead of one per assignment
+    user_ids = [ObjectId(user_task["userId"]) for user_task in user_tasks if ObjectId.is_valid(user_task["userId"])]
+    users_cursor = user_collection.find({"_id": {"$in": user_ids}}, {"firstname": 1, "lastname": 1})
+    users_by_id = {str(user["_id"]): user for user in await users_cursor.to_list(length=None)}
+
     users = []
     for user_task in user_tasks:
-        user = await user_collection.find_one({"_id": ObjectId(user_task["userId"])})
+        user = users_by_id.get(str(user_task["userId"]))
         if user:
             users.append({
                 "user_id": str(user["_id"]),
@@ -8,13 +8,41 @@ from routes.task_routes import router as task_router
 from routes.project_module_routes import router as project_module_router
 from routes.user_task_routes import router as user_task_router
 from routes.status_routes import router as status_router
+from routes.search_routes import router as search_router
+from config.database import connect_to_mongo, close_mongo_connection
+from config.indexes import ensure_indexes, index_drift
+from contextlib import asynccontextmanager
+from utils.PaginationUtil import NEXT_CURSOR_HEADER
+from utils.EmailWorker import email_worker
+from utils.ChangeStreamUtil import change_hub
+from utils.ResponseUtil import MongoJSONResponse, MessagePackNegotiation
+from utils.CompressionUtil import CompressionMiddleware
+from utils.MetricsUtil import metrics_middleware, metrics_endpoint
+from utils.LoggingUtil import setup_logging, request_id_middleware, REQUEST_ID_HEADER
 import logging
 
-logging.basicConfig(level=logging.DEBUG, format="%(asctime)s - %(levelname)s - %(message)s",filename="Logs.log")
+log_listener = setup_logging()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await connect_to_mongo()
+
+    await ensure_indexes()
+    drift = await index_drift()
+    if drift:
+        logging.warning(f"Index drift detected: {drift}")
+
+    email_worker.start()
+    change_hub.start()
+    yield
+
+    await change_hub.stop()
+    await email_worker.stop()
+    close_mongo_connection()
+    log_listener.stop()
 
 # FastAPI app setup
-app = FastAPI()
-logging.info("Root endpoint hit")
+app = FastAPI(default_response_class=MongoJSONResponse, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -22,8 +50,20 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, REQUEST_ID_HEADER, "ETag"],
 )
 
+# Content negotiation: gzip/br for bodies above COMPRESS_MIN_BYTES, MessagePack on Accept: application/msgpack
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(MessagePackNegotiation)
+
+app.middleware("http")(metrics_middleware)
+app.middleware("http")(request_id_middleware)
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return metrics_endpoint()
+
 # Include routers
 app.include_router(project_router)
 app.include_router(user_router)
@@ -32,4 +72,5 @@ app.include_router(project_team_router)
 app.include_router(task_router)
 app.include_router(project_module_router)
 app.include_router(user_task_router)
-app.include_router(status_router)
\ No newline at end of file
+app.include_router(status_router)
+app.include_router(search_router)
\ No newline at end of file
@@ -1,11 +1,14 @@
 from pydantic import BaseModel, Field, validator
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from bson import ObjectId
 
 class UserTask(BaseModel):
     userId: str
     taskId: str
 
+class BulkUserTask(BaseModel):
+    assignments: List[UserTask]
+
 class UserTaskOut(UserTask):
     user_task_id: str = Field(alias='_id')
 
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from controllers.admin_controller import (
     get_all_developers,
     get_all_managers,
@@ -8,7 +8,8 @@ from controllers.admin_controller import (
     deassign_developers_from_project
 )
 from pydantic import BaseModel
-from typing import List
+from utils.PaginationUtil import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, paginated_response
+from typing import List, Optional
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
@@ -27,20 +28,30 @@ async def deassign_manager_from_project_route(project_id: str, manager_id: str):
 
 # Route to get all managers
 @router.get("/managers")
-async def get_managers_route():
-    return await get_all_managers()
+async def get_managers_route(limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), after: Optional[str] = None):
+    return paginated_response(*await get_all_managers(limit, after))
 
 # Route to get all developers
 @router.get("/developers")
-async def get_developers_route():
-    return await get_all_developers()
+async def get_developers_route(limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), after: Optional[str] = None):
+    return paginated_response(*await get_all_developers(limit, after))
 
 # Route to assign developers to a project
 @router.put("/projects/{project_id}/assign-developers/{developer_id}")
 async def assign_developers_to_project_route(project_id: str, developer_id: str):
-    return await assign_developers_to_project(project_id, developer_id)
+    return await assign_developers_to_project(project_id, [developer_id])
+
+# Route to assign several developers to a project in one call
+@router.put("/projects/{project_id}/assign-developers")
+async def assign_developers_bulk_route(project_id: str, request: AssignDevelopersRequest):
+    return await assign_developers_to_project(project_id, request.developers)
 
 # Route to deassign developers from a project
 @router.delete("/projects/{project_id}/deassign-developers/{developer_id}")
 async def deassign_developers_from_project_route(project_id: str, developer_id: str):
-    return await deassign_developers_from_project(project_id, developer_id)
+    return await deassign_developers_from_project(project_id, [developer_id])
+
+# Route to deassign several developers from a project in one call
+@router.delete("/projects/{project_id}/deassign-developers")
+async def deassign_developers_bulk_route(project_id: str, request: AssignDevelopersRequest):
+    return await deassign_developers_from_project(project_id, request.developers)
@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Body
+from fastapi import APIRouter, Body, Query, Request
 from controllers.project_controller import (
     create_project, get_all_projects, get_project, assign_manager_to_project,
     get_projects_by_manager, get_developers_by_manager, get_assigned_developers,
-    get_developer_projects, delete_project
+    get_developer_projects, delete_project, get_project_dashboard
 )
 from models.project_model import Project
-from typing import List
+from utils.PaginationUtil import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, paginated_response
+from utils.ETagUtil import conditional_response
+from typing import List, Optional
 
 router = APIRouter(tags=["Projects"])
 
@@ -14,13 +16,20 @@ async def post_project(project: Project):
     return await create_project(project)
 
 @router.get("/projects/")
-async def get_all_projects_route():
-    return await get_all_projects()
+async def get_all_projects_route(request: Request, limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), after: Optional[str] = None):
+    async def build():
+        return paginated_response(*await get_all_projects(limit, after))
+    return await conditional_response(request, ["projects"], build)
 
 @router.get("/projects/{project_id}/")
 async def get_project_route(project_id: str):
     return await get_project(project_id)
 
+@router.get("/projects/{project_id}/dashboard")
+async def get_project_dashboard_route(project_id: str):
+    """API to fetch a project with its modules, task counts, effort totals and team in one call"""
+    return await get_project_dashboard(project_id)
+
 @router.get("/managers/{manager_id}/projects/")
 async def get_projects_by_manager_route(manager_id: str):
     return await get_projects_by_manager(manager_id)
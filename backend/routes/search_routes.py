@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Header, Query
+from controllers.search_controller import search
+from utils.PaginationUtil import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, paginated_response
+from typing import List, Optional
+
+router = APIRouter(tags=["Search"])
+
+@router.get("/search")
+async def search_route(
+    q: str = Query(..., min_length=1, description="Search terms"),
+    types: Optional[List[str]] = Query(None, description="project, module and/or task"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    user_id: str = Header(..., convert_underscores=False)  # Results are scoped to this user's projects
+):
+    return paginated_response(*await search(q, user_id, types, limit, after))
@@ -1,7 +1,8 @@
 # routes/status_routes.py
-from fastapi import APIRouter,Body
+from fastapi import APIRouter,Body,Request
 from controllers.status_controller import create_status,get_all_status,get_status,delete_status,update_status,get_modules_and_statuses
 from models.status_model import Status,StatusOut
+from utils.ETagUtil import conditional_response, modules_scope
 from typing import List
 
 
@@ -16,12 +17,14 @@ async def getStatus(status_id: str):
     return await get_status(status_id)
 
 @router.get("/status", response_model=List[StatusOut])
-async def getAllStatus():
-    return await get_all_status()
+async def getAllStatus(request: Request):
+    return await conditional_response(request, ["status"], get_all_status)
 
 @router.get("/{project_id}/modules-statuses", response_model=dict)
-async def get_modules_and_statuses_route(project_id:str):
-    return await get_modules_and_statuses(project_id)
+async def get_modules_and_statuses_route(request: Request, project_id:str):
+    return await conditional_response(
+        request, [modules_scope(project_id), "status", "projects"], lambda: get_modules_and_statuses(project_id)
+    )
 
 @router.put("/status/{status_id}", response_model=StatusOut)
 async def updateStatus(status_id: str, updated_status: Status):
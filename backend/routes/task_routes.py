@@ -1,7 +1,9 @@
-from fastapi import APIRouter,Form,UploadFile,File
-from controllers.task_controller import create_task, get_project_tasks, update_task, delete_task,get_tasks_for_developer,update_task_status,get_task_status
+from fastapi import APIRouter,Form,UploadFile,File,BackgroundTasks,Query,Request,HTTPException,Header
+from controllers.task_controller import create_task, get_project_tasks, export_project_tasks, stream_project_events, update_task, delete_task,get_tasks_for_developer,update_task_status,get_task_status,import_tasks,parse_task_csv
 from typing import List,Optional
 from models.task_model import Task,TaskOut
+from utils.ResponseUtil import MongoJSONResponse
+from utils.ETagUtil import conditional_response, tasks_scope
 
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
@@ -12,7 +14,8 @@ router = APIRouter(prefix="/tasks", tags=["Tasks"])
 #     return await create_task(task)
 
 @router.post("/", response_model=dict)
-async def create_new_task(title: str = Form(...),
+async def create_new_task(background_tasks: BackgroundTasks,
+    title: str = Form(...),
     priority: str = Form(...),
     description: str = Form(...),
     totalMinutes: int = Form(...),
@@ -22,17 +25,45 @@ async def create_new_task(title: str = Form(...),
     image: Optional[UploadFile] = File(None)
 ):
     """API to create a new task"""
-    return await create_task(title,priority,description,totalMinutes,module_id,project_id,status_id,image)
+    return await create_task(title,priority,description,totalMinutes,module_id,project_id,status_id,image,background_tasks)
+
+@router.post("/bulk", response_model=dict)
+async def bulk_import_tasks(request: Request):
+    """API to import many tasks at once from a JSON array or a CSV body (Content-Type: text/csv)"""
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("text/csv"):
+        try:
+            rows = parse_task_csv((await request.body()).decode("utf-8-sig"))
+        except UnicodeDecodeError:
+            raise HTTPException(status_code=400, detail="CSV body must be UTF-8")
+    else:
+        try:
+            rows = await request.json()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Malformed JSON body")
+        if not isinstance(rows, list):
+            raise HTTPException(status_code=400, detail="Expected a JSON array of tasks")
+    return await import_tasks(rows)
 
 @router.get("/{project_id}", response_model=List[TaskOut])
-async def fetch_project_tasks(project_id: str):
-    """API to fetch tasks for a specific project"""
-    return await get_project_tasks(project_id)
+async def fetch_project_tasks(request: Request, project_id: str):
+    """API to fetch tasks for a specific project. Answers 304 when If-None-Match is still current"""
+    return await conditional_response(request, [tasks_scope(project_id)], lambda: get_project_tasks(project_id))
+
+@router.get("/{project_id}/export")
+async def export_tasks(project_id: str, format: str = Query("csv", pattern="^(csv|ndjson)$")):
+    """API to stream all tasks of a project as CSV or NDJSON"""
+    return await export_project_tasks(project_id, format)
+
+@router.get("/{project_id}/events")
+async def project_task_events(request: Request, project_id: str, last_event_id: Optional[str] = Header(None, alias="Last-Event-ID")):
+    """API to receive live task/module/assignment changes of a project (Server-Sent Events)"""
+    return await stream_project_events(request, project_id, last_event_id)
 
 @router.put("/{task_id}", response_model=dict)
-async def modify_task(task_id: str, updated_task: Task):
+async def modify_task(task_id: str, updated_task: Task, background_tasks: BackgroundTasks):
     """API to update a task"""
-    return await update_task(task_id, updated_task)
+    return await update_task(task_id, updated_task, image=None, background_tasks=background_tasks)
 
 @router.delete("/{task_id}", response_model=dict)
 async def remove_task(task_id: str):
@@ -40,9 +71,9 @@ async def remove_task(task_id: str):
     return await delete_task(task_id)
 
 @router.get("/developer/{developer_id}/{project_id}",response_model=List[TaskOut])
-async def get_tasks_for_developer_route(developer_id: str, project_id: str):
+async def get_tasks_for_developer_route(developer_id: str, project_id: str, status_id: Optional[str] = None, priority: Optional[str] = None):
     """API to fetch tasks assigned to a specific developer for a project"""
-    return await get_tasks_for_developer(developer_id, project_id)
+    return MongoJSONResponse(await get_tasks_for_developer(developer_id, project_id, status_id, priority))
 
 @router.get("/{task_id}/status")
 async def get_task_status_route(task_id: str):
@@ -1,4 +1,6 @@
 from fastapi import APIRouter, Header,Query
+from utils.PaginationUtil import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, paginated_response
+from typing import Optional
 from models.user_model import UserLogin,UserRegister
 from controllers.user_controller import user_login,user_register,user_delete,get_all_users
 
@@ -20,5 +22,5 @@ async def delete_user(
     return await user_delete(email, admin_id)
 
 @router.get("/users")
-async def get_users():
-    return await get_all_users()
\ No newline at end of file
+async def get_users(limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), after: Optional[str] = None):
+    return paginated_response(*await get_all_users(limit, after))
\ No newline at end of file
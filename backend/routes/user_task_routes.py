@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends
-from controllers.user_task_controller import assign_task, get_user_tasks, remove_task_assignment, get_users_by_task
-from models.user_task_model import UserTask
+from controllers.user_task_controller import assign_task, assign_tasks_bulk, get_user_tasks, remove_task_assignment, get_users_by_task
+from models.user_task_model import UserTask, BulkUserTask
 
 router = APIRouter(prefix="/user-tasks", tags=["User Tasks"])
 
@@ -9,6 +9,11 @@ router = APIRouter(prefix="/user-tasks", tags=["User Tasks"])
 async def assign_task_to_user(user_task: UserTask):
     return await assign_task(user_task)
 
+# Assign many tasks to users in one request
+@router.post("/assign/bulk")
+async def assign_tasks_bulk_route(bulk: BulkUserTask):
+    return await assign_tasks_bulk(bulk)
+
 # Get all tasks assigned to a specific user, including user details (like full name)
 @router.get("/{user_id}")
 async def fetch_user_tasks(user_id: str):
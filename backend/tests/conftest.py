@@ -0,0 +1,53 @@
+import asyncio
+import os
+import pytest
+
+# Tests run against a throwaway database on a local server. The change stream tests need a
+# single-node replica set: mongod --replSet rs0, then rs.initiate() once in mongosh.
+TEST_MONGODB_URL = os.getenv("TEST_MONGODB_URL", "mongodb://localhost:27017/?directConnection=true")
+TEST_DATABASE = os.getenv("TEST_MONGO_DATABASE", "project_manager_test")
+
+# Must be set before config.database is imported
+os.environ["MONGODB_URL"] = TEST_MONGODB_URL
+os.environ["MONGO_DATABASE"] = TEST_DATABASE
+# Importing main sets up logging; keep test runs from writing Logs.log
+os.environ.setdefault("LOG_FILE", os.devnull)
+
+@pytest.fixture(scope="session")
+def mongo_server():
+    """The server's hello reply. Skips when no MongoDB is reachable."""
+    pymongo = pytest.importorskip("pymongo")
+    client = pymongo.MongoClient(TEST_MONGODB_URL, serverSelectionTimeoutMS=2000)
+    try:
+        hello = client.admin.command("hello")
+    except pymongo.errors.PyMongoError:
+        client.close()
+        pytest.skip(f"No MongoDB reachable at {TEST_MONGODB_URL}")
+
+    yield hello
+    client.drop_database(TEST_DATABASE)
+    client.close()
+
+@pytest.fixture
+def replica_set(mongo_server):
+    if "setName" not in mongo_server:
+        pytest.skip("Change streams need a replica set")
+    return mongo_server
+
+@pytest.fixture
+def run(mongo_server):
+    """Runs an async scenario on a fresh event loop, with a fresh Motor client and an empty database."""
+    from config.database import close_mongo_connection, get_client
+    from controllers.status_controller import invalidate_status_cache
+
+    def _run(scenario):
+        async def wrapper():
+            await get_client().drop_database(TEST_DATABASE)
+            invalidate_status_cache()
+            try:
+                return await scenario()
+            finally:
+                close_mongo_connection()
+
+        return asyncio.run(wrapper())
+    return _run
@@ -0,0 +1,56 @@
+import asyncio
+import pytest
+
+pytest.importorskip("motor")
+
+from bson import ObjectId
+from config.database import tasks_collection, project_modules_collection, user_task_collection
+from utils.ChangeStreamUtil import ChangeStreamHub
+import orjson
+
+EVENT_TIMEOUT = 10
+
+async def _next_event(subscription):
+    token, data = await asyncio.wait_for(subscription.queue.get(), EVENT_TIMEOUT)
+    return token, orjson.loads(data)
+
+def test_hub_fans_out_per_project_and_replays_on_reconnect(run, replica_set):
+    async def scenario():
+        hub = ChangeStreamHub()
+        hub.start()
+        try:
+            await asyncio.wait_for(hub.ready.wait(), EVENT_TIMEOUT)
+            project_id, other_project_id = ObjectId(), ObjectId()
+            board = hub.subscribe(str(project_id))
+            other_board = hub.subscribe(str(other_project_id))
+
+            task = {"_id": ObjectId(), "title": "Board task", "project_id": project_id}
+            await tasks_collection.insert_one(task)
+            await project_modules_collection.insert_one({"moduleName": "API", "projectId": project_id})
+            await user_task_collection.insert_one({"userId": str(ObjectId()), "taskId": str(task["_id"]), "projectId": str(project_id)})
+            await tasks_collection.delete_one({"_id": task["_id"]})
+
+            events = [await _next_event(board) for _ in range(4)]
+            # Deletes carry no document and go to every board
+            other_events = [await _next_event(other_board)]
+            return hub, project_id, events, other_events
+        finally:
+            await hub.stop()
+
+    hub, project_id, events, other_events = run(scenario)
+
+    assert [(event["type"], event["op"]) for _, event in events] == [
+        ("task", "insert"), ("module", "insert"), ("assignment", "insert"), ("task", "delete")
+    ]
+    assert all(event["projectId"] == str(project_id) for _, event in events[:3])
+    assert [(event["type"], event["op"]) for _, event in other_events] == [("task", "delete")]
+
+    # A reconnect with the first event id gets everything after it from the replay buffer
+    first_token = events[0][0]
+    resumed = hub.subscribe(str(project_id), last_event_id=first_token)
+    replayed = [resumed.queue.get_nowait()[0] for _ in range(resumed.queue.qsize())]
+    assert replayed == [token for token, _ in events[1:]]
+    assert not resumed.lagged
+
+    # An id that is no longer buffered asks the client to resync
+    assert hub.subscribe(str(project_id), last_event_id="unknown").lagged
@@ -0,0 +1,84 @@
+import asyncio
+import socket
+import pytest
+
+pytest.importorskip("motor")
+pytest.importorskip("aiosmtplib")
+controller = pytest.importorskip("aiosmtpd.controller")
+
+from aiosmtplib import SMTPServerDisconnected
+from utils import EmailWorker
+
+MESSAGE = "Subject: Task assigned\n\nYou have a new task."
+
+class Inbox:
+    """aiosmtpd handler that keeps what it receives and can hang up on the next MAIL FROM."""
+
+    def __init__(self):
+        self.received = []
+        self.peers = set()
+        self.drop_next = False
+
+    async def handle_MAIL(self, server, session, envelope, address, mail_options):
+        self.peers.add(session.peer)
+        if self.drop_next:
+            # What a server that timed out an idle connection looks like to the client
+            self.drop_next = False
+            server.transport.close()
+            return "421 Closing connection"
+        envelope.mail_from = address
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.received.extend(envelope.rcpt_tos)
+        return "250 OK"
+
+@pytest.fixture
+def inbox(monkeypatch):
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    handler = Inbox()
+    server = controller.Controller(handler, hostname="127.0.0.1", port=port)
+    server.start()
+    monkeypatch.setattr(EmailWorker, "SMTP_SERVER", "127.0.0.1")
+    monkeypatch.setattr(EmailWorker, "SMTP_PORT", port)
+    monkeypatch.setattr(EmailWorker, "SMTP_USE_TLS", False)
+    monkeypatch.setattr(EmailWorker, "GMAIL_USER", None)
+    yield handler
+    server.stop()
+
+def test_pool_reuses_connection(inbox):
+    async def scenario():
+        pool = EmailWorker.SMTPPool(1)
+        await pool.send("pm@example.com", "dev1@example.com", MESSAGE)
+        await pool.send("pm@example.com", "dev2@example.com", MESSAGE)
+        await pool.close()
+
+    asyncio.run(scenario())
+    assert inbox.received == ["dev1@example.com", "dev2@example.com"]
+    assert len(inbox.peers) == 1
+
+def test_dropped_pooled_connection_is_retried_once(inbox):
+    async def scenario():
+        pool = EmailWorker.SMTPPool(1)
+        await pool.send("pm@example.com", "dev1@example.com", MESSAGE)
+        inbox.drop_next = True
+        await pool.send("pm@example.com", "dev2@example.com", MESSAGE)
+        await pool.close()
+
+    asyncio.run(scenario())
+    assert inbox.received == ["dev1@example.com", "dev2@example.com"]
+    assert len(inbox.peers) == 2
+
+def test_fresh_connection_failure_is_raised(inbox):
+    async def scenario():
+        pool = EmailWorker.SMTPPool(1)
+        inbox.drop_next = True
+        await pool.send("pm@example.com", "dev1@example.com", MESSAGE)
+
+    # Only a reused connection gets the free retry; the outbox counts this as an attempt
+    with pytest.raises(SMTPServerDisconnected):
+        asyncio.run(scenario())
+    assert inbox.received == []
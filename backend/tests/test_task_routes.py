@@ -0,0 +1,71 @@
+import pytest
+
+pytest.importorskip("motor")
+httpx = pytest.importorskip("httpx")
+
+from bson import ObjectId
+from config.database import status_collection, tasks_collection, project_collection, user_task_collection
+from main import app
+
+def api_client():
+    """In-process client on the scenario's event loop; the lifespan is not run."""
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+async def _insert_task(**fields):
+    status = {"_id": ObjectId(), "status": "Pending"}
+    await status_collection.insert_one(status)
+    project = {"_id": ObjectId(), "title": "Board"}
+    await project_collection.insert_one(project)
+    task = {
+        "_id": ObjectId(), "title": "Old title", "priority": "Low", "description": "d", "totalMinutes": 30,
+        "module_id": ObjectId(), "project_id": project["_id"], "status_id": status["_id"], **fields
+    }
+    await tasks_collection.insert_one(task)
+    return task
+
+def _task_json(task, **changes):
+    body = {
+        "id": str(task["_id"]), "title": task["title"], "priority": task["priority"], "description": task["description"],
+        "totalMinutes": task["totalMinutes"], "module_id": str(task["module_id"]),
+        "project_id": str(task["project_id"]), "status_id": str(task["status_id"]),
+    }
+    return {**body, **changes}
+
+def test_json_put_updates_task(run):
+    async def scenario():
+        task = await _insert_task()
+        async with api_client() as client:
+            response = await client.put(f"/tasks/{task['_id']}", json=_task_json(task, title="New title", totalMinutes=90))
+        stored = await tasks_collection.find_one({"_id": task["_id"]})
+        project = await project_collection.find_one({"_id": task["project_id"]})
+        return response, stored, project
+
+    response, stored, project = run(scenario)
+    assert response.status_code == 200, response.text
+    assert response.json() == {"message": "Task updated successfully"}
+    assert stored["title"] == "New title"
+    assert stored["totalMinutes"] == 90
+    # The rollup moved by the minutes difference
+    assert project["rollup"]["totalMinutes"] == 60
+
+def test_moving_a_task_moves_its_assignments(run):
+    async def scenario():
+        task = await _insert_task()
+        developer_id = str(ObjectId())
+        await user_task_collection.insert_one({"userId": developer_id, "taskId": str(task["_id"]), "projectId": str(task["project_id"])})
+        new_project = {"_id": ObjectId(), "title": "Other board"}
+        await project_collection.insert_one(new_project)
+
+        async with api_client() as client:
+            response = await client.put(f"/tasks/{task['_id']}", json=_task_json(task, project_id=str(new_project["_id"])))
+            old_board = await client.get(f"/tasks/developer/{developer_id}/{task['project_id']}")
+            new_board = await client.get(f"/tasks/developer/{developer_id}/{new_project['_id']}")
+        assignment = await user_task_collection.find_one({"userId": developer_id})
+        return response, assignment, new_project, old_board, new_board
+
+    response, assignment, new_project, old_board, new_board = run(scenario)
+    assert response.status_code == 200, response.text
+    assert assignment["projectId"] == str(new_project["_id"])
+    # The developer board follows the task to its new project
+    assert old_board.json() == []
+    assert [task["project_id"] for task in new_board.json()] == [str(new_project["_id"])]
@@ -0,0 +1,58 @@
+import pytest
+
+pytest.importorskip("motor")
+
+from bson import ObjectId
+from prometheus_client import REGISTRY
+from config.database import user_collection, user_task_collection
+from controllers.user_task_controller import get_user_tasks, get_users_by_task
+
+# Below the default find batch size, so no getMore is involved
+ASSIGNMENTS = 50
+
+def mongo_command_count():
+    """Commands seen so far by the MongoCommandMetrics listener on the app's client."""
+    return sum(
+        sample.value
+        for metric in REGISTRY.collect() if metric.name == "mongo_commands"
+        for sample in metric.samples if sample.name == "mongo_commands_total"
+    )
+
+async def _insert_users(count: int):
+    users = [
+        {"_id": ObjectId(), "firstname": f"Dev{i}", "lastname": "Test", "role": "developer", "email": f"dev{i}@example.com"}
+        for i in range(count)
+    ]
+    await user_collection.insert_many(users)
+    return users
+
+def test_get_users_by_task_uses_constant_queries(run):
+    async def scenario():
+        task_id = str(ObjectId())
+        users = await _insert_users(ASSIGNMENTS)
+        await user_task_collection.insert_many([{"userId": str(user["_id"]), "taskId": task_id} for user in users])
+
+        before = mongo_command_count()
+        result = await get_users_by_task(task_id)
+        return result, mongo_command_count() - before
+
+    result, commands = run(scenario)
+    assert len(result) == ASSIGNMENTS
+    # One user_tasks find and one batched users find, however many assignees
+    assert commands == 2
+
+def test_get_user_tasks_fetches_user_once(run):
+    async def scenario():
+        [user] = await _insert_users(1)
+        await user_task_collection.insert_many(
+            [{"userId": str(user["_id"]), "taskId": str(ObjectId())} for _ in range(ASSIGNMENTS)]
+        )
+
+        before = mongo_command_count()
+        result = await get_user_tasks(str(user["_id"]))
+        return result, mongo_command_count() - before
+
+    result, commands = run(scenario)
+    assert len(result) == ASSIGNMENTS
+    assert all(task["assignedTo"] == "Dev0 Test" for task in result)
+    assert commands == 2
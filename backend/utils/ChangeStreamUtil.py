@@ -0,0 +1,189 @@
+from collections import deque
+from pymongo.errors import OperationFailure, PyMongoError
+from config.database import db
+from utils.ResponseUtil import _default
+from dotenv import load_dotenv
+import asyncio
+import logging
+import orjson
+import os
+
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+# Recent events kept for clients reconnecting with Last-Event-ID
+CHANGE_STREAM_REPLAY_SIZE = int(os.getenv("CHANGE_STREAM_REPLAY_SIZE", 1000))
+# Events buffered per subscriber before it is told to resync
+SSE_QUEUE_SIZE = int(os.getenv("SSE_QUEUE_SIZE", 200))
+SSE_HEARTBEAT_SECONDS = float(os.getenv("SSE_HEARTBEAT_SECONDS", 15))
+WATCH_MAX_BACKOFF_SECONDS = 60
+# ChangeStreamHistoryLost / resume point no longer in the oplog
+HISTORY_LOST_CODES = {280, 286}
+
+# Watched collection -> (event type, field holding the project id)
+WATCHED = {
+    "tasks": ("task", "project_id"),
+    "project_modules": ("module", "projectId"),
+    "user_tasks": ("assignment", "projectId"),
+}
+WATCH_PIPELINE = [{"$match": {
+    "ns.coll": {"$in": list(WATCHED)},
+    "operationType": {"$in": ["insert", "update", "replace", "delete"]},
+}}]
+
+class Subscription:
+    """ One connected board. Events arrive through a bounded queue; on overflow the
+    client gets a resync event and refetches instead of blocking the watcher. """
+
+    def __init__(self, project_id: str):
+        self.project_id = project_id
+        self.queue = asyncio.Queue(SSE_QUEUE_SIZE)
+        self.lagged = False
+
+    def push(self, token: str, data: bytes):
+        try:
+            self.queue.put_nowait((token, data))
+        except asyncio.QueueFull:
+            self.lagged = True
+
+    def drain(self):
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.lagged = False
+
+class ChangeStreamHub:
+    """ One change stream per process over tasks, project_modules and user_tasks,
+    fanned out to per-project subscribers. """
+
+    def __init__(self, replay_size: int = CHANGE_STREAM_REPLAY_SIZE):
+        self._subscribers = {}
+        self._replay = deque(maxlen=replay_size)
+        self._resume_token = None
+        self._runner = None
+        self._stopping = False
+        # Set while the change stream is open
+        self.ready = asyncio.Event()
+
+    def start(self):
+        if self._runner is None:
+            self._stopping = False
+            self._runner = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._stopping = True
+        if self._runner:
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+            self._runner = None
+        self.ready.clear()
+
+    def subscribe(self, project_id: str, last_event_id: str = None):
+        """ Registers a subscriber. With last_event_id, the events it missed are queued first,
+        or it is flagged for resync when that event is no longer in the replay buffer. """
+        subscription = Subscription(project_id)
+        if last_event_id:
+            tokens = [token for token, _, _ in self._replay]
+            if last_event_id in tokens:
+                for token, event_project, data in list(self._replay)[tokens.index(last_event_id) + 1:]:
+                    if event_project in (None, project_id):
+                        subscription.push(token, data)
+            else:
+                subscription.lagged = True
+        self._subscribers.setdefault(project_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscribers = self._subscribers.get(subscription.project_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.project_id]
+
+    def _publish(self, change: dict):
+        event_type, project_field = WATCHED[change["ns"]["coll"]]
+        document = change.get("fullDocument")
+        project_id = document.get(project_field) if document else None
+        project_id = str(project_id) if project_id else None
+
+        event = {
+            "type": event_type,
+            "op": change["operationType"],
+            "id": change["documentKey"]["_id"],
+            "projectId": project_id,
+            "document": document,
+            "updatedFields": change.get("updateDescription", {}).get("updatedFields"),
+        }
+        token = change["_id"]["_data"]
+        data = orjson.dumps(event, default=_default, option=orjson.OPT_NON_STR_KEYS)
+        self._replay.append((token, project_id, data))
+
+        # Deletes carry no document, so every board gets them and ignores unknown ids
+        if project_id:
+            targets = self._subscribers.get(project_id, ())
+        else:
+            targets = [subscription for subscribers in self._subscribers.values() for subscription in subscribers]
+        for subscription in list(targets):
+            subscription.push(token, data)
+
+    def _resync_all(self):
+        self._replay.clear()
+        for subscribers in self._subscribers.values():
+            for subscription in subscribers:
+                subscription.lagged = True
+
+    async def _run(self):
+        delay = 1
+        while not self._stopping:
+            try:
+                async with db.watch(WATCH_PIPELINE, full_document="updateLookup", resume_after=self._resume_token) as stream:
+                    delay = 1
+                    # try_next() opens the cursor right away, so no change made after ready is set is missed
+                    change = await stream.try_next()
+                    self.ready.set()
+                    while True:
+                        self._resume_token = stream.resume_token
+                        if change is not None:
+                            try:
+                                self._publish(change)
+                            except Exception as e:
+                                logger.error(f"Failed to publish change event: {e}")
+                        if not stream.alive:
+                            break
+                        change = await stream.try_next()
+            except OperationFailure as e:
+                if e.code in HISTORY_LOST_CODES:
+                    # Events were missed, start from now and make every board refetch
+                    self._resume_token = None
+                    self._resync_all()
+                # A standalone mongod has no change streams (code 40573); keep retrying slowly
+                logger.warning(f"Change stream failed: {e}")
+            except PyMongoError as e:
+                logger.warning(f"Change stream interrupted: {e}")
+            self.ready.clear()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, WATCH_MAX_BACKOFF_SECONDS)
+
+async def sse_events(request, subscription: Subscription):
+    """ Server-Sent Events for one subscription. The resume token is the event id,
+    so the browser's EventSource sends it back as Last-Event-ID on reconnect. """
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            if subscription.lagged:
+                subscription.drain()
+                yield "event: resync\ndata: {}\n\n"
+            try:
+                token, data = await asyncio.wait_for(subscription.queue.get(), SSE_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield ": keep-alive\n\n"
+                continue
+            yield f"id: {token}\nevent: change\ndata: {data.decode()}\n\n"
+    finally:
+        change_hub.unsubscribe(subscription)
+
+change_hub = ChangeStreamHub()
@@ -1,8 +1,14 @@
 import cloudinary
 from cloudinary.uploader import upload
+from fastapi import HTTPException, UploadFile
+from bson import ObjectId
 from dotenv import load_dotenv
+import asyncio
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
 load_dotenv()
 
 #cloundinary configuration
@@ -12,9 +18,42 @@ cloudinary.config(
     api_secret=os.getenv("API_SECRET")
 )
 
+ALLOWED_IMAGE_EXTENSIONS = {"jpg", "jpeg", "png"}
+ALLOWED_IMAGE_TYPES = {"image/jpeg", "image/png"}
+MAX_IMAGE_BYTES = int(os.getenv("MAX_IMAGE_BYTES", 5 * 1024 * 1024))
+CHUNK_SIZE = 1024 * 1024
+
 #util functionn...
 
+async def save_upload(image: UploadFile, upload_dir: str):
+    """ Validates the image and streams it to upload_dir in chunks. Returns the file path. """
+    file_ext = image.filename.rsplit(".", 1)[-1].lower() if image.filename and "." in image.filename else ""
+    if file_ext not in ALLOWED_IMAGE_EXTENSIONS or (image.content_type and image.content_type not in ALLOWED_IMAGE_TYPES):
+        raise HTTPException(status_code=400, detail="Invalid image format")
+
+    # Reject early when the client sent the size up front
+    if getattr(image, "size", None) and image.size > MAX_IMAGE_BYTES:
+        raise HTTPException(status_code=413, detail="Image too large")
+
+    os.makedirs(upload_dir, exist_ok=True)
+    file_path = os.path.join(upload_dir, f"{ObjectId()}.{file_ext}")
+
+    size = 0
+    try:
+        with open(file_path, "wb") as buffer:
+            while chunk := await image.read(CHUNK_SIZE):
+                size += len(chunk)
+                if size > MAX_IMAGE_BYTES:
+                    raise HTTPException(status_code=413, detail="Image too large")
+                await asyncio.to_thread(buffer.write, chunk)
+    except Exception:
+        os.remove(file_path)
+        raise
+
+    return file_path
+
 async def upload_image(image):
-    result = upload(image)
-    print("cloundianry response,",result)
-    return result["secure_url"] #string
\ No newline at end of file
+    # cloudinary's uploader is synchronous, keep it off the event loop
+    result = await asyncio.to_thread(upload, image)
+    logger.debug(f"cloundianry response, {result}")
+    return result["secure_url"] #string
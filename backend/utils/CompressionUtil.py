@@ -0,0 +1,95 @@
+from starlette.datastructures import Headers, MutableHeaders
+from utils.ResponseUtil import parse_qualities
+from dotenv import load_dotenv
+import asyncio
+import gzip
+import os
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+load_dotenv()
+# Bodies smaller than this go out as-is, compression would cost more than it saves
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", 1024))
+# Bodies larger than this are compressed in a worker thread instead of on the event loop
+COMPRESS_THREAD_MIN_BYTES = int(os.getenv("COMPRESS_THREAD_MIN_BYTES", 256 * 1024))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", 6))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", 4))
+
+COMPRESSIBLE_TYPES = ("application/json", "application/msgpack", "application/x-msgpack", "application/x-ndjson", "text/")
+
+def choose_encoding(accept_encoding: str):
+    """ Best supported encoding the client accepts, brotli before gzip on equal q. """
+    qualities = parse_qualities(accept_encoding)
+    candidates = (["br"] if brotli else []) + ["gzip"]
+    best, best_q = None, 0.0
+    for encoding in candidates:
+        q = qualities.get(encoding, qualities.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+def compress(body: bytes, encoding: str):
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+class CompressionMiddleware:
+    """ ASGI middleware compressing complete response bodies with br or gzip.
+    Streamed responses (exports) and bodies under minimum_size pass through untouched. """
+
+    def __init__(self, app, minimum_size: int = COMPRESS_MIN_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            return await self.app(scope, receive, send)
+
+        start = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=start["headers"])
+            content_type = headers.get("content-type", "")
+            if (
+                message.get("more_body", False)
+                or len(body) < self.minimum_size
+                or "content-encoding" in headers
+                or not content_type.startswith(COMPRESSIBLE_TYPES)
+            ):
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            if len(body) >= COMPRESS_THREAD_MIN_BYTES:
+                body = await asyncio.to_thread(compress, body, encoding)
+            else:
+                body = compress(body, encoding)
+
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            # The compressed bytes differ from the identity ones, so the validator becomes weak
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = "W/" + etag
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
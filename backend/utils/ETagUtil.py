@@ -0,0 +1,51 @@
+from fastapi import Request, Response
+from pymongo import UpdateOne
+from config.database import version_collection
+from utils.ResponseUtil import MongoJSONResponse, response_format_var
+import hashlib
+
+# Version counters, one document per scope in the versions collection:
+#   "projects", "status", "tasks:<project_id>", "modules:<project_id>"
+# Write controllers bump the scopes they touch; GET endpoints derive a strong ETag from them.
+
+def tasks_scope(project_id):
+    return f"tasks:{project_id}"
+
+def modules_scope(project_id):
+    return f"modules:{project_id}"
+
+async def bump_versions(*scopes):
+    scopes = {str(scope) for scope in scopes if scope}
+    if scopes:
+        await version_collection.bulk_write(
+            [UpdateOne({"_id": scope}, {"$inc": {"v": 1}}, upsert=True) for scope in scopes], ordered=False
+        )
+
+async def _current_etag(request: Request, scopes):
+    docs = await version_collection.find({"_id": {"$in": list(scopes)}}).to_list(None)
+    versions = {doc["_id"]: doc["v"] for doc in docs}
+    # JSON and MessagePack bodies are different representations, keep their tags apart
+    key = "|".join(
+        [request.url.path, request.url.query, response_format_var.get()]
+        + [f"{scope}={versions.get(scope, 0)}" for scope in sorted(scopes)]
+    )
+    return '"' + hashlib.sha1(key.encode("utf-8")).hexdigest()[:20] + '"'
+
+def _matches(if_none_match: str, etag: str):
+    if not if_none_match:
+        return False
+    # Weak comparison: a compressed response carries the same tag as W/"..."
+    candidates = [value.strip().removeprefix("W/") for value in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+async def conditional_response(request: Request, scopes, build):
+    """ Answers 304 when the client's ETag is still current, before any document is fetched.
+    build is an async callable returning the body (or a ready Response). """
+    etag = await _current_etag(request, scopes)
+    if _matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    content = await build()
+    response = content if isinstance(content, Response) else MongoJSONResponse(content)
+    response.headers["ETag"] = etag
+    return response
@@ -0,0 +1,182 @@
+import aiosmtplib
+import asyncio
+from datetime import datetime, timedelta
+from email.mime.text import MIMEText
+from dotenv import load_dotenv
+from pymongo import ReturnDocument
+from config.database import email_outbox_collection
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Load environment variables
+load_dotenv()
+SMTP_SERVER = os.getenv("SMTP_SERVER", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", 465))
+SMTP_USE_TLS = os.getenv("SMTP_USE_TLS", "true").lower() == "true"
+GMAIL_USER = os.getenv("GMAIL_USER")
+GMAIL_APP_PASSWORD = os.getenv("GMAIL_APP_PASSWORD")
+
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", 2))
+EMAIL_MAX_ATTEMPTS = int(os.getenv("EMAIL_MAX_ATTEMPTS", 5))
+EMAIL_RETRY_BASE_SECONDS = float(os.getenv("EMAIL_RETRY_BASE_SECONDS", 30))
+EMAIL_POLL_SECONDS = float(os.getenv("EMAIL_POLL_SECONDS", 5))
+# A message stuck in "sending" this long (worker crashed mid-send) is picked up again
+EMAIL_LOCK_TIMEOUT = timedelta(minutes=5)
+
+class SMTPPool:
+    """ Small pool of authenticated SMTP connections reused across messages. """
+
+    def __init__(self, size: int = SMTP_POOL_SIZE):
+        self.size = size
+        self._idle = asyncio.Queue()
+        self._slots = asyncio.Semaphore(size)
+
+    async def _connect(self):
+        server = aiosmtplib.SMTP(hostname=SMTP_SERVER, port=SMTP_PORT, use_tls=SMTP_USE_TLS)
+        await server.connect()
+        if GMAIL_USER and GMAIL_APP_PASSWORD:
+            await server.login(GMAIL_USER, GMAIL_APP_PASSWORD)
+        return server
+
+    async def _sendmail(self, server, sender, recipient, message: str):
+        try:
+            await server.sendmail(sender, recipient, message)
+        except Exception:
+            # Drop the connection, the next attempt opens a fresh one
+            server.close()
+            raise
+
+    async def send(self, sender, recipient, message: str):
+        async with self._slots:
+            server = None
+            while not self._idle.empty():
+                candidate = self._idle.get_nowait()
+                if candidate.is_connected:
+                    server = candidate
+                    break
+            pooled = server is not None
+            if not pooled:
+                server = await self._connect()
+
+            try:
+                await self._sendmail(server, sender, recipient, message)
+            except (aiosmtplib.SMTPServerDisconnected, ConnectionError) as e:
+                if not pooled:
+                    raise
+                # The server closed an idle connection; that is not a delivery failure, so retry
+                # once on a fresh connection instead of spending one of the message's attempts
+                logger.info(f"Pooled SMTP connection was dropped ({e}), retrying on a new one")
+                server = await self._connect()
+                await self._sendmail(server, sender, recipient, message)
+            self._idle.put_nowait(server)
+
+    async def close(self):
+        while not self._idle.empty():
+            server = self._idle.get_nowait()
+            try:
+                await server.quit()
+            except Exception:
+                server.close()
+
+class EmailOutboxWorker:
+    """ Drains the email_outbox collection in the background with bounded concurrency. """
+
+    def __init__(self, pool_size: int = SMTP_POOL_SIZE):
+        self.pool = SMTPPool(pool_size)
+        self._concurrency = asyncio.Semaphore(pool_size)
+        self._wake = asyncio.Event()
+        self._in_flight = set()
+        self._runner = None
+        self._stopping = False
+
+    def wake(self):
+        self._wake.set()
+
+    def start(self):
+        if self._runner is None:
+            self._stopping = False
+            self._runner = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._stopping = True
+        self._wake.set()
+        if self._runner:
+            await self._runner
+            self._runner = None
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+        await self.pool.close()
+
+    async def _claim(self):
+        """ Atomically moves the next due message to "sending" so only one worker delivers it. """
+        now = datetime.utcnow()
+        return await email_outbox_collection.find_one_and_update(
+            {"$or": [
+                {"status": "pending", "next_attempt_at": {"$lte": now}},
+                {"status": "sending", "locked_at": {"$lte": now - EMAIL_LOCK_TIMEOUT}}
+            ]},
+            {"$set": {"status": "sending", "locked_at": now}},
+            sort=[("next_attempt_at", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def _run(self):
+        while not self._stopping:
+            await self._concurrency.acquire()
+            self._wake.clear()
+            try:
+                job = await self._claim()
+            except Exception as e:
+                logger.error(f"Email outbox claim failed: {e}")
+                job = None
+
+            if job is None:
+                self._concurrency.release()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), EMAIL_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            task = asyncio.create_task(self._deliver(job))
+            self._in_flight.add(task)
+            task.add_done_callback(self._finished)
+
+    def _finished(self, task):
+        self._in_flight.discard(task)
+        self._concurrency.release()
+
+    async def _deliver(self, job):
+        msg = MIMEText(job["body"], "html")
+        msg['Subject'] = job["subject"]
+        msg['From'] = GMAIL_USER
+        msg['To'] = job["recipient"]
+
+        try:
+            await self.pool.send(GMAIL_USER, job["recipient"], msg.as_string())
+        except Exception as e:
+            attempts = job.get("attempts", 0) + 1
+            if attempts >= EMAIL_MAX_ATTEMPTS:
+                update = {"status": "failed", "attempts": attempts, "last_error": str(e)}
+            else:
+                # Exponential backoff: base, 2*base, 4*base, ...
+                delay = EMAIL_RETRY_BASE_SECONDS * (2 ** (attempts - 1))
+                update = {
+                    "status": "pending",
+                    "attempts": attempts,
+                    "last_error": str(e),
+                    "next_attempt_at": datetime.utcnow() + timedelta(seconds=delay)
+                }
+            logger.warning(f"Failed to send email to {job['recipient']} (attempt {attempts}): {e}")
+            await email_outbox_collection.update_one({"_id": job["_id"]}, {"$set": update, "$unset": {"locked_at": ""}})
+            return
+
+        await email_outbox_collection.update_one(
+            {"_id": job["_id"]},
+            {"$set": {"status": "sent", "sent_at": datetime.utcnow()}, "$inc": {"attempts": 1}, "$unset": {"locked_at": ""}}
+        )
+        logger.info(f"Email sent successfully to {job['recipient']}!")
+
+email_worker = EmailOutboxWorker()
@@ -0,0 +1,108 @@
+from logging.handlers import QueueHandler, QueueListener
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from fastapi import Request
+from dotenv import load_dotenv
+import copy
+import json
+import logging
+import os
+import queue
+import random
+import uuid
+
+load_dotenv()
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FILE = os.getenv("LOG_FILE", "Logs.log")
+# e.g. "pymongo=0.01,motor=0.01": keep 1% of their records below WARNING
+LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "pymongo=0.01,motor=0.01")
+REQUEST_ID_HEADER = "X-Request-ID"
+
+request_id_var = ContextVar("request_id", default=None)
+
+class RequestIdFilter(logging.Filter):
+    """ Stamps the current request id on the record before it leaves the request's context. """
+
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+class SamplingFilter(logging.Filter):
+    """ Keeps only a fraction of DEBUG/INFO records from noisy loggers. """
+
+    def __init__(self, rates: dict):
+        super().__init__()
+        self.rates = rates
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        for name, rate in self.rates.items():
+            if record.name == name or record.name.startswith(name + "."):
+                return random.random() < rate
+        return True
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+class StructuredQueueHandler(QueueHandler):
+    """ QueueHandler.prepare() formats the record and folds the traceback into msg.
+    This keeps the message and the traceback apart so JsonFormatter can emit "exc". """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        return record
+
+def _parse_rates(value: str):
+    rates = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        name, _, rate = item.partition("=")
+        rates[name] = float(rate)
+    return rates
+
+def setup_logging():
+    """ Routes all logging through a queue so the event loop never waits on disk I/O.
+    Returns the QueueListener that writes the JSON records; stop it on shutdown. """
+    log_queue = queue.SimpleQueue()
+
+    queue_handler = StructuredQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(_parse_rates(LOG_SAMPLE_RATES)))
+    queue_handler.addFilter(RequestIdFilter())
+
+    file_handler = logging.FileHandler(LOG_FILE)
+    file_handler.setFormatter(JsonFormatter())
+
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(LOG_LEVEL)
+
+    listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    return listener
+
+async def request_id_middleware(request: Request, call_next):
+    request_id = request.headers.get(REQUEST_ID_HEADER) or uuid.uuid4().hex
+    token = request_id_var.set(request_id)
+    try:
+        response = await call_next(request)
+    finally:
+        request_id_var.reset(token)
+    response.headers[REQUEST_ID_HEADER] = request_id
+    return response
@@ -0,0 +1,75 @@
+from prometheus_client import Counter, Gauge, Histogram, CONTENT_TYPE_LATEST, generate_latest
+from pymongo import monitoring
+from fastapi import Request, Response
+import time
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ["method", "route", "status"]
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled", ["method"]
+)
+MONGO_COMMAND_DURATION = Histogram(
+    "mongo_command_duration_seconds", "MongoDB command latency", ["collection", "command"],
+    buckets=(.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5)
+)
+MONGO_COMMANDS = Counter(
+    "mongo_commands_total", "MongoDB commands executed", ["collection", "command", "outcome"]
+)
+HASH_QUEUE_DEPTH = Gauge(
+    "password_hash_queue_depth", "bcrypt hash/verify jobs running or waiting in the executor"
+)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total", "Application cache lookups", ["cache", "result"]
+)
+
+# Commands whose first field is not a collection name
+_COLLECTION_FIELD = {"getMore": "collection"}
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """ pymongo CommandListener recording duration and count per collection and command. """
+
+    def __init__(self):
+        self._collections = {}
+
+    def started(self, event):
+        field = _COLLECTION_FIELD.get(event.command_name, event.command_name)
+        collection = event.command.get(field)
+        self._collections[(event.connection_id, event.request_id)] = collection if isinstance(collection, str) else ""
+
+    def _finish(self, event, outcome):
+        collection = self._collections.pop((event.connection_id, event.request_id), "")
+        MONGO_COMMAND_DURATION.labels(collection, event.command_name).observe(event.duration_micros / 1e6)
+        MONGO_COMMANDS.labels(collection, event.command_name, outcome).inc()
+
+    def succeeded(self, event):
+        self._finish(event, "success")
+
+    def failed(self, event):
+        self._finish(event, "failure")
+
+def _route_label(request: Request):
+    # Use the route template (/tasks/{project_id}) so ids do not explode label cardinality
+    route = request.scope.get("route")
+    return route.path if route else "unmatched"
+
+async def metrics_middleware(request: Request, call_next):
+    if request.url.path == "/metrics":
+        return await call_next(request)
+
+    method = request.method
+    start = time.perf_counter()
+    # The route is only resolved inside call_next, so in-flight requests are tracked per method
+    in_flight = REQUESTS_IN_FLIGHT.labels(method)
+    in_flight.inc()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        in_flight.dec()
+        REQUEST_DURATION.labels(method, _route_label(request), str(status)).observe(time.perf_counter() - start)
+
+def metrics_endpoint():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,33 @@
+from fastapi import HTTPException
+from bson import ObjectId
+from utils.ResponseUtil import MongoJSONResponse
+from dotenv import load_dotenv
+import os
+
+load_dotenv()
+
+DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", 100))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", 500))
+NEXT_CURSOR_HEADER = "X-Next-After"
+
+#keyset pagination on _id...
+
+async def paginate(collection, query: dict, projection: dict, limit: int = DEFAULT_PAGE_SIZE, after: str = None):
+    """ Returns (documents, next_after). next_after is None on the last page. """
+    limit = max(1, min(limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE))
+
+    if after:
+        if not ObjectId.is_valid(after):
+            raise HTTPException(status_code=400, detail="Invalid cursor format")
+        query = {**query, "_id": {"$gt": ObjectId(after)}}
+
+    # Fetch one extra document to know whether another page exists
+    docs = await collection.find(query, projection).sort("_id", 1).limit(limit + 1).to_list(limit + 1)
+
+    next_after = str(docs[limit - 1]["_id"]) if len(docs) > limit else None
+    return docs[:limit], next_after
+
+def paginated_response(items, next_after: str):
+    """ Returns the page as a plain list (what the UI expects) with the next cursor in a header. """
+    headers = {NEXT_CURSOR_HEADER: next_after} if next_after else None
+    return MongoJSONResponse(items, headers=headers)
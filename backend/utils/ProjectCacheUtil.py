@@ -0,0 +1,127 @@
+from collections import OrderedDict
+from config.database import project_collection
+from utils.MetricsUtil import CACHE_LOOKUPS
+from bson import ObjectId
+from dotenv import load_dotenv
+import logging
+import orjson
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+# "memory" keeps a cache per worker process; "redis" shares one across workers
+PROJECT_CACHE_BACKEND = os.getenv("PROJECT_CACHE_BACKEND", "memory")
+PROJECT_CACHE_SIZE = int(os.getenv("PROJECT_CACHE_SIZE", 10000))
+PROJECT_CACHE_TTL_SECONDS = float(os.getenv("PROJECT_CACHE_TTL_SECONDS", 300))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+# Only the fields module and task lookups need
+PROJECT_META_PROJECTION = {"title": 1, "manager_id": 1, "manager_email": 1}
+
+class MemoryBackend:
+    """ Bounded LRU with a per-entry TTL, local to this process. """
+
+    def __init__(self, max_size: int = PROJECT_CACHE_SIZE, ttl: float = PROJECT_CACHE_TTL_SECONDS):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+
+    async def get(self, key: str):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: dict):
+        self._entries[key] = (value, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str):
+        self._entries.pop(key, None)
+
+class RedisBackend:
+    """ Redis-compatible backend shared by all workers. Entries expire after the TTL;
+    the size bound comes from the server's maxmemory / allkeys-lru policy. """
+
+    def __init__(self, url: str = REDIS_URL, ttl: float = PROJECT_CACHE_TTL_SECONDS, prefix: str = "project-meta:"):
+        # Optional dependency, only needed when this backend is selected
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(url)
+        self.ttl = int(ttl)
+        self.prefix = prefix
+
+    async def get(self, key: str):
+        raw = await self._redis.get(self.prefix + key)
+        return orjson.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: dict):
+        await self._redis.set(self.prefix + key, orjson.dumps(value), ex=self.ttl)
+
+    async def delete(self, key: str):
+        await self._redis.delete(self.prefix + key)
+
+BACKENDS = {"memory": MemoryBackend, "redis": RedisBackend}
+
+class ProjectMetadataCache:
+    """ Read-through cache of project title, manager and existence.
+    Writers that change those fields (manager assignment, project deletion) call invalidate(). """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._generations = {}
+
+    async def get(self, project_id):
+        """ Returns {"_id", "title", "manager_id", "manager_email"} or None when the project does not exist. """
+        key = str(project_id)
+        try:
+            cached = await self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Project cache read failed: {e}")
+            cached = None
+
+        if cached is not None:
+            self.hits += 1
+            CACHE_LOOKUPS.labels("project_meta", "hit").inc()
+            return cached if cached.get("exists") else None
+
+        self.misses += 1
+        CACHE_LOOKUPS.labels("project_meta", "miss").inc()
+        generation = self._generations.get(key, 0)
+        project = await project_collection.find_one({"_id": ObjectId(key)}, PROJECT_META_PROJECTION)
+        entry = {
+            "exists": True,
+            "_id": key,
+            "title": project.get("title"),
+            "manager_id": str(project["manager_id"]) if project.get("manager_id") else None,
+            "manager_email": project.get("manager_email"),
+        } if project else {"exists": False}
+
+        # Skip storing if a write invalidated the entry while we were loading
+        if generation == self._generations.get(key, 0):
+            try:
+                await self.backend.set(key, entry)
+            except Exception as e:
+                logger.warning(f"Project cache write failed: {e}")
+        return entry if project else None
+
+    async def invalidate(self, project_id):
+        key = str(project_id)
+        self._generations[key] = self._generations.get(key, 0) + 1
+        await self.backend.delete(key)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+project_cache = ProjectMetadataCache(BACKENDS[PROJECT_CACHE_BACKEND]())
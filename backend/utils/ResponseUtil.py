@@ -0,0 +1,90 @@
+from fastapi.encoders import ENCODERS_BY_TYPE
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from bson import ObjectId, Decimal128
+from contextvars import ContextVar
+from datetime import date, datetime
+from starlette.datastructures import Headers
+import msgpack
+import orjson
+
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+
+# Set per request by MessagePackNegotiation when the client prefers MessagePack
+response_format_var = ContextVar("response_format", default="json")
+
+# Let jsonable_encoder handle ObjectId too, for routes that still go through it
+ENCODERS_BY_TYPE[ObjectId] = str
+
+def _default(obj):
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(by_alias=True)
+    if isinstance(obj, Decimal128):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+def _msgpack_default(obj):
+    # Same wire values as the JSON body, datetimes as ISO strings
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    return _default(obj)
+
+def parse_qualities(header: str):
+    """ Parses an Accept / Accept-Encoding header into {token: q}. """
+    qualities = {}
+    for item in filter(None, (part.strip() for part in (header or "").split(","))):
+        token, *params = [piece.strip() for piece in item.split(";")]
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qualities[token.lower()] = q
+    return qualities
+
+def prefers_msgpack(accept: str):
+    qualities = parse_qualities(accept)
+    msgpack_q = max(qualities.get(media_type, 0.0) for media_type in MSGPACK_MEDIA_TYPES)
+    return msgpack_q > 0 and msgpack_q >= qualities.get("application/json", 0.0)
+
+#response class...
+
+class MongoJSONResponse(JSONResponse):
+    """ orjson-based JSON response that encodes ObjectId, datetime and nested Mongo documents natively,
+    so controllers can return raw documents without converting every _id by hand.
+    Renders MessagePack instead when the request negotiated it. """
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        if response_format_var.get() == "msgpack":
+            self.media_type = MSGPACK_MEDIA_TYPES[0]
+            return msgpack.packb(content, default=_msgpack_default, use_bin_type=True)
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+    def init_headers(self, headers=None):
+        super().init_headers(headers)
+        # The same URL has a JSON and a MessagePack representation
+        self.headers.add_vary_header("Accept")
+
+class MessagePackNegotiation:
+    """ ASGI middleware: picks the body format from the Accept header before the route runs. """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not prefers_msgpack(Headers(scope=scope).get("accept")):
+            return await self.app(scope, receive, send)
+
+        token = response_format_var.set("msgpack")
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            response_format_var.reset(token)
@@ -1,6 +1,7 @@
 import React, { useState, useEffect } from "react";
 import axios from "axios";
 import { API_BASE_URL } from "../../App";
+import { fetchAllPages } from "../../utils/fetchAllPages";
 
 export const AddTask = () => {
   const [projects, setProjects] = useState([]);
@@ -24,8 +25,7 @@ export const AddTask = () => {
   // Fetch Projects
   const fetchProjects = async () => {
     try {
-      const response = await axios.get(`${API_BASE_URL}/projects/`);
-      setProjects(response.data || []);
+      setProjects(await fetchAllPages(`${API_BASE_URL}/projects/`));
     } catch (error) {
       console.error("Error fetching projects:", error);
     }
@@ -3,6 +3,7 @@ import axios from "axios";
 import Cookies from "js-cookie";
 import Select from "react-select";
 import { API_BASE_URL } from "../../App";
+import { fetchAllPages } from "../../utils/fetchAllPages";
 
 const AssignProjectToDevelopers = () => {
   const [projects, setProjects] = useState([]);
@@ -21,10 +22,7 @@ const AssignProjectToDevelopers = () => {
 
     const fetchProjects = async () => {
       try {
-        const response = await axios.get(
-          `${API_BASE_URL}/projects/`
-        );
-        setProjects(response.data || []); // Ensure it's an array
+        setProjects(await fetchAllPages(`${API_BASE_URL}/projects/`));
       } catch (error) {
         console.error("Error fetching projects:", error);
       }
@@ -32,10 +30,7 @@ const AssignProjectToDevelopers = () => {
 
     const fetchDevelopers = async () => {
       try {
-        const response = await axios.get(
-          `${API_BASE_URL}/admin/developers`
-        );
-        setDevelopers(response.data || []);
+        setDevelopers(await fetchAllPages(`${API_BASE_URL}/admin/developers`));
       } catch (error) {
         console.error("Error fetching developers:", error);
       }
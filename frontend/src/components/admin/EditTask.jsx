@@ -1,6 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import axios from 'axios';
 import { API_BASE_URL } from '../../App';
+import { fetchAllPages } from "../../utils/fetchAllPages";
 
 export const EditTask = ({ task, onUpdate, onCancel }) => {
   const [formData, setFormData] = useState({
@@ -34,8 +35,8 @@ export const EditTask = ({ task, onUpdate, onCancel }) => {
   }, [task]);
 
   useEffect(() => {
-    axios.get(`${API_BASE_URL}/projects/`)
-      .then(res => setProjects(res.data || []))
+    fetchAllPages(`${API_BASE_URL}/projects/`)
+      .then(projects => setProjects(projects))
       .catch(err => console.error("Error fetching projects:", err));
   }, []);
 
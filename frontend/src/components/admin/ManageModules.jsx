@@ -3,6 +3,7 @@ import Cookies from "js-cookie";
 import { useForm } from 'react-hook-form';
 import axios from 'axios';
 import { API_BASE_URL } from '../../App';
+import { fetchAllPages } from "../../utils/fetchAllPages";
 
 export const ManageModules = () => {
   const { register, handleSubmit, reset, setValue, watch } = useForm();
@@ -17,10 +18,7 @@ export const ManageModules = () => {
   // Fetch projects for dropdown
   const fetchProjects = async () => {
     try {
-      const response = await axios.get(`${API_BASE_URL}/projects/`);
-      console.log(response);
-      
-      setProjects(response.data || []);
+      setProjects(await fetchAllPages(`${API_BASE_URL}/projects/`));
     } catch (error) {
       console.error("Error fetching projects:", error);
     }
@@ -28,8 +26,7 @@ export const ManageModules = () => {
 
   const fetchAllModules = async () => {
     try {
-        const projectsResponse = await axios.get(`${API_BASE_URL}/projects/`);
-        const projects = projectsResponse.data;
+        const projects = await fetchAllPages(`${API_BASE_URL}/projects/`);
 
         if (!projects || projects.length === 0) {
             setModules([]);
@@ -3,6 +3,7 @@ import { useForm } from "react-hook-form";
 import Select from "react-select";
 import "bootstrap/dist/css/bootstrap.min.css";
 import { API_BASE_URL } from "../../App";
+import { fetchAllPages } from "../../utils/fetchAllPages";
 
 export const ProjectForm = ({ project }) => {
   const { register, handleSubmit, reset, watch, setError, clearErrors, formState: { errors }, setValue } = useForm();
@@ -11,9 +12,7 @@ export const ProjectForm = ({ project }) => {
   useEffect(() => {
     const fetchManagers = async () => {
       try {
-        const response = await fetch(`${API_BASE_URL}/admin/managers`);
-        if (!response.ok) throw new Error("Failed to fetch managers");
-        const data = await response.json();
+        const data = await fetchAllPages(`${API_BASE_URL}/admin/managers`);
         setManagers(data.map(manager => ({ value: manager.email, label: manager.email })));
       } catch (error) {
         console.error("Error fetching managers:", error);
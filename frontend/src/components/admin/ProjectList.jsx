@@ -1,5 +1,6 @@
 import React, { useEffect, useState } from "react";
 import { API_BASE_URL } from "../../App";
+import { fetchAllPages } from "../../utils/fetchAllPages";
 import "bootstrap/dist/css/bootstrap.min.css"; // Make sure Bootstrap is still imported
 import { ProjectForm } from "./ProjectForm";
 
@@ -11,10 +12,7 @@ export const ProjectList = () => {
   useEffect(() => {
     const fetchProjects = async () => {
       try {
-        const response = await fetch(`${API_BASE_URL}/projects/`);
-        console.log(`URL IS : ${API_BASE_URL}/projects/`);
-        if (!response.ok) throw new Error("Failed to fetch projects");
-        const data = await response.json();
+        const data = await fetchAllPages(`${API_BASE_URL}/projects/`);
         setProjects(data);
       } catch (error) {
         console.error("Error fetching projects:", error);
@@ -1,5 +1,6 @@
 import React, { useEffect, useState } from "react";
 import { API_BASE_URL } from "../../App"; // Ensure this is correctly imported
+import { fetchAllPages } from "../../utils/fetchAllPages";
 import "bootstrap/dist/css/bootstrap.min.css"; // Import Bootstrap CSS
 import Cookies from 'js-cookie';
 import axios from "axios";
@@ -10,9 +11,7 @@ export const Users = ({ errors }) => {
   useEffect(() => {
     const fetchUsers = async () => {
       try {
-        const response = await fetch(`${API_BASE_URL}/users/`);
-        if (!response.ok) throw new Error("Failed to fetch users");
-        const data = await response.json();
+        const data = await fetchAllPages(`${API_BASE_URL}/users/`);
         setUsers(data.map(user => user.email));
       } catch (error) {
         console.error("Error fetching users:", error);
@@ -0,0 +1,14 @@
+import axios from "axios";
+
+// List endpoints (/projects/, /users/, /admin/managers, /admin/developers) return one page
+// per request and put the cursor for the next page in the X-Next-After header.
+export const fetchAllPages = async (url, params = {}) => {
+  const items = [];
+  let after = null;
+  do {
+    const response = await axios.get(url, { params: after ? { ...params, after } : params });
+    items.push(...(response.data || []));
+    after = response.headers["x-next-after"] || null;
+  } while (after);
+  return items;
+};